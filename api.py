@@ -5,12 +5,12 @@ FastAPI Backend for SyncApply
 This module provides the REST API that the frontend uses to interact with
 Gmail and the Supabase database. It handles:
     - Token verification for protected endpoints
-    - Email fetching from Gmail (with parallel processing for speed)
+    - Email fetching from Gmail (batched into a single request for speed)
     - Saving job applications to the database
 
 Endpoints:
     GET  /                           - Health check
-    GET  /api/emails                 - Fetch emails from Gmail
+    GET  /api/emails                 - Fetch emails from Gmail (streamed as NDJSON)
     GET  /api/emails/{email_id}      - Get a single email
     POST /api/applications/save/{id} - Save an email as application
     GET  /api/applications           - Get all saved applications
@@ -21,6 +21,9 @@ Usage:
     
     Or with uvicorn directly:
     uvicorn api:app --reload
+    
+    For multi-core production servers, run several workers with gunicorn:
+    gunicorn -k uvicorn.workers.UvicornWorker -w $((2 * $(nproc) + 1)) api:app
 """
 
 # =============================================================================
@@ -28,26 +31,39 @@ Usage:
 # =============================================================================
 
 import os
+import time
 import asyncio
-from typing import Optional
+import hashlib
+import logging
+from typing import Annotated, Optional, AsyncIterator
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 from fetch_emails import (
     GmailFetcher, 
+    GmailAuthError,
     JobApplicationTracker, 
+    extract_email_content,
     format_email_for_llm,
     ExtractedEmail
 )
+from llm_cache import llm_cache
 
 # Load environment variables
 load_dotenv()
 
+# Configured in the __main__ block below (or by whatever runs the app)
+logger = logging.getLogger("syncapply")
+
 
 # =============================================================================
 # CONFIGURATION
@@ -57,12 +73,98 @@ load_dotenv()
 # Set ENVIRONMENT=production in your deployment platform (Railway, etc.)
 IS_PRODUCTION = os.getenv('ENVIRONMENT', 'development').lower() == 'production'
 
+# Frontend origins allowed to call the API (comma-separated)
+# Set ALLOWED_ORIGINS to your frontend domain(s) in your deployment platform
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv('ALLOWED_ORIGINS', '').split(',')
+    if origin.strip()
+]
+
+# Local Vite dev servers are only allowed outside production
+if not IS_PRODUCTION:
+    ALLOWED_ORIGINS += [
+        "http://localhost:3000",    # Local Vite dev server (alternate port)
+        "http://localhost:5173",    # Default Vite dev server
+    ]
+
+# How long (in seconds) browsers may cache CORS preflight responses
+CORS_MAX_AGE = 86400
+
 # Debug file path for logging email content during development
 DEBUG_EMAIL_FILE = "email_for_llm.txt"
 
-# Thread pool for parallel email fetching
-# This allows us to fetch multiple emails concurrently
-THREAD_POOL = ThreadPoolExecutor(max_workers=10)
+# Thread pool for blocking work that must stay off the event loop:
+# the synchronous Supabase client, the LLM call and debug file writes
+# (Gmail calls are async and do not use it)
+THREAD_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+# Maximum Gmail batch requests a single user can have in flight at once
+# Keeps one user from starving others and from hitting Gmail's per-user quota
+GMAIL_CONCURRENCY_PER_USER = 5
+
+# Per-user semaphores unused for this long (in seconds) are dropped
+USER_SEMAPHORE_IDLE_TTL = 600
+
+# Number of emails fetched per Gmail batch request when streaming /api/emails
+# Smaller groups mean the first emails reach the client sooner
+STREAM_BATCH_SIZE = 10
+
+# Limits on /api/emails inputs
+# Out-of-range values are rejected with 422 before any Gmail call is made
+MAX_EMAILS_PER_REQUEST = 100
+MAX_QUERY_LENGTH = 512
+
+# Gmail message IDs are plain letters and digits (hex in practice);
+# anything else is rejected with 422
+GMAIL_ID_PATTERN = r"^[A-Za-z0-9]+$"
+
+# Browser caching policy for the applications list
+# Short enough that new applications show up quickly on a normal reload
+APPLICATIONS_CACHE_CONTROL = "private, max-age=30"
+
+# How long (in seconds) the server reuses the serialized applications list
+# Saves through this worker clear it immediately (see invalidate_applications_cache)
+APPLICATIONS_CACHE_TTL = 10
+
+# Serialized applications list: (monotonic expiry time, JSON body, ETag)
+_applications_cache: Optional[tuple[float, bytes, str]] = None
+
+# Longest Authorization header we accept (Google access tokens are far shorter)
+MAX_AUTH_HEADER_LENGTH = 4096
+
+# Timeout (in seconds) for Google's tokeninfo endpoint
+TOKENINFO_TIMEOUT = 5.0
+
+# How long (in seconds) a verified token is trusted before asking Google again
+TOKEN_CACHE_TTL = 300
+
+# Maximum number of verified tokens kept in memory
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# Verified tokens: sha256(token) -> monotonic expiry time
+# Kept in insertion order so the oldest entries can be evicted first
+_token_cache: OrderedDict[str, float] = OrderedDict()
+
+# Maximum number of per-token GmailFetcher instances kept alive
+FETCHER_CACHE_MAX_SIZE = 1024
+
+
+# =============================================================================
+# RESPONSE CLASS
+# =============================================================================
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson instead of the stdlib json module.
+    
+    orjson is implemented in C and is several times faster at encoding the
+    long email bodies and application lists this API returns. (FastAPI's
+    own ORJSONResponse is deprecated, so a minimal version lives here.)
+    """
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
 
 # =============================================================================
@@ -73,29 +175,61 @@ THREAD_POOL = ThreadPoolExecutor(max_workers=10)
 # This avoids creating a new Supabase client connection on every request
 job_tracker = JobApplicationTracker()
 
+# One GmailFetcher per access token (keyed by sha256 of the token)
+# Fetchers share the app-wide HTTP client, so connections are pooled
+# across all users
+_fetcher_cache: OrderedDict[str, GmailFetcher] = OrderedDict()
+
+# Per-user concurrency limits: token hash -> (semaphore, last used time)
+_user_semaphores: dict[str, tuple[asyncio.Semaphore, float]] = {}
+
 
 # =============================================================================
 # FASTAPI APP SETUP
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage resources that live for the whole lifetime of the app.
+    
+    A single shared httpx.AsyncClient is created on startup and used for
+    token verification and every Gmail request, so keep-alive (and HTTP/2)
+    connections to Google are reused instead of doing a new TCP+TLS
+    handshake on every request.
+    """
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+    eviction_task = asyncio.create_task(evict_idle_user_semaphores())
+    
+    yield
+    
+    eviction_task.cancel()
+    await app.state.http_client.aclose()
+    logger.info(llm_cache.summary())
+
+
 app = FastAPI(
     title="SyncApply API",
     description="Gmail Job Application Tracker API - Fetch emails and track job applications",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS to allow frontend connections
-# In production, you should restrict this to your actual frontend domain
+# Origins are an explicit allowlist (no "*"), so browsers can cache the
+# preflight OPTIONS response instead of sending one before every request
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",    # Local Vite dev server (alternate port)
-        "http://localhost:5173",    # Default Vite dev server
-        "*"                         # Allow all origins (for development)
-    ],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=CORS_MAX_AGE,
 )
 
 
@@ -141,28 +275,81 @@ class SaveResult(BaseModel):
     data: Optional[ApplicationResponse] = None
 
 
+class SaveBatchRequest(BaseModel):
+    """
+    Request model for saving several emails at once.
+    """
+    ids: list[Annotated[str, Field(pattern=GMAIL_ID_PATTERN)]] = Field(
+        min_length=1, max_length=MAX_EMAILS_PER_REQUEST
+    )
+
+
+class SaveBatchResult(BaseModel):
+    """
+    Response model for batch save operations.
+    
+    Lists the emails that were saved; the rest were duplicates or not
+    job applications.
+    """
+    saved: list[str]
+    skipped: list[str]
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-def save_email_for_debugging(email: ExtractedEmail):
+def _write_debug_file(email: ExtractedEmail):
     """
-    Save email content to a file for debugging purposes.
+    Write the LLM-formatted email to the debug file.
     
-    Only runs in development mode to avoid unnecessary disk I/O in production.
-    The file is gitignored so it won't be committed.
+    This does blocking disk I/O, so it should only be called from a
+    worker thread (see save_email_for_debugging_async).
     
     Args:
         email: The extracted email to save
     """
-    # Skip in production to improve performance
-    if IS_PRODUCTION:
-        return
-        
     formatted = format_email_for_llm(email)
     with open(DEBUG_EMAIL_FILE, "w", encoding="utf-8") as f:
         f.write(formatted)
-    print(f"Debug: Saved email to {DEBUG_EMAIL_FILE}")
+    logger.info("Debug: Saved email to %s", DEBUG_EMAIL_FILE)
+
+
+def _extract_and_save_applications(raw_emails: list[dict]) -> list[str]:
+    """
+    Extract raw Gmail messages and save the job applications among them.
+    
+    Decoding up to MAX_EMAILS_PER_REQUEST full MIME messages, the LLM and
+    Supabase are all blocking work, so this should only be called from a
+    worker thread (see save_applications_batch).
+    
+    Args:
+        raw_emails: Gmail message dicts from fetch_email_details_batch
+    
+    Returns:
+        Gmail IDs of the emails saved as new applications
+    """
+    extracted = [
+        extract_email_content(raw, need_attachments=False, need_html=False)
+        for raw in raw_emails
+    ]
+    return job_tracker.save_applications(extracted)
+
+
+async def save_email_for_debugging_async(email: ExtractedEmail):
+    """
+    Save email content to a file for debugging purposes.
+    
+    The file write runs in the thread pool so it never blocks the event
+    loop. Callers should only await this in development mode (check
+    IS_PRODUCTION first) so production skips even the thread dispatch.
+    The file is gitignored so it won't be committed.
+    
+    Args:
+        email: The extracted email to save
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(THREAD_POOL, _write_debug_file, email)
 
 
 def extract_email_to_response(extracted: ExtractedEmail) -> EmailResponse:
@@ -170,6 +357,8 @@ def extract_email_to_response(extracted: ExtractedEmail) -> EmailResponse:
     Convert an ExtractedEmail to an EmailResponse.
     
     Helper function to avoid code duplication when converting emails.
+    The data comes from our own extraction code, so the model is built
+    with model_construct() and skips Pydantic validation.
     
     Args:
         extracted: The extracted email data
@@ -177,24 +366,222 @@ def extract_email_to_response(extracted: ExtractedEmail) -> EmailResponse:
     Returns:
         EmailResponse object ready for API response
     """
-    return EmailResponse(
+    return EmailResponse.model_construct(
         id=extracted.id,
-        subject=extracted.headers.get("Subject"),
-        sender=extracted.headers.get("From"),
-        date=extracted.headers.get("Date"),
+        subject=extracted.subject,
+        sender=extracted.sender,
+        date=extracted.date,
         snippet=extracted.snippet,
         body_text=extracted.body_text
     )
 
 
-async def verify_google_token(authorization: str = Header(...)) -> str:
+def extract_email_to_ndjson_line(extracted: ExtractedEmail) -> bytes:
+    """
+    Serialize an ExtractedEmail as one NDJSON line in the EmailResponse shape.
+    
+    Used on the streaming hot path, where building a Pydantic model per
+    email only to dump it again is wasted work; orjson writes the plain
+    dict straight to bytes.
+    
+    Args:
+        extracted: The extracted email data
+    
+    Returns:
+        The JSON object followed by a newline, as bytes
+    """
+    return orjson.dumps({
+        "id": extracted.id,
+        "subject": extracted.subject,
+        "sender": extracted.sender,
+        "date": extracted.date,
+        "snippet": extracted.snippet,
+        "body_text": extracted.body_text,
+    }) + b"\n"
+
+
+def semaphore_for(token: str) -> asyncio.Semaphore:
+    """
+    Get the concurrency-limiting semaphore for a user's token.
+    
+    Every Gmail request made with this token should hold the semaphore,
+    so one user can never have more than GMAIL_CONCURRENCY_PER_USER
+    requests in flight.
+    
+    Args:
+        token: Validated Google access token
+    
+    Returns:
+        The semaphore shared by all requests made with this token
+    """
+    cache_key = hashlib.sha256(token.encode()).hexdigest()[:16]
+    entry = _user_semaphores.get(cache_key)
+    semaphore = entry[0] if entry else asyncio.Semaphore(GMAIL_CONCURRENCY_PER_USER)
+    
+    _user_semaphores[cache_key] = (semaphore, time.monotonic())
+    return semaphore
+
+
+async def evict_idle_user_semaphores():
+    """
+    Background task that drops semaphores of users who went idle.
+    
+    Without this, _user_semaphores would grow by one entry per token
+    ever seen. Runs for the lifetime of the app (see lifespan).
+    """
+    while True:
+        await asyncio.sleep(USER_SEMAPHORE_IDLE_TTL)
+        
+        cutoff = time.monotonic() - USER_SEMAPHORE_IDLE_TTL
+        for cache_key, (semaphore, last_used) in list(_user_semaphores.items()):
+            if last_used < cutoff and not semaphore.locked():
+                del _user_semaphores[cache_key]
+
+
+async def stream_emails_as_ndjson(
+    fetcher: GmailFetcher,
+    first_page: list[str],
+    more_pages: AsyncIterator[list[str]],
+    semaphore: asyncio.Semaphore,
+    force_refresh: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Fetch emails in concurrent batch groups and yield them as NDJSON lines.
+    
+    The message IDs are split into groups of STREAM_BATCH_SIZE, each group
+    is fetched with one Gmail batch request, and the groups run concurrently
+    on the event loop. Emails are yielded as soon as their group completes
+    (not in list order).
+    
+    Later list pages are read in the background while the first page's
+    groups are already being fetched, and their groups join the same pool.
+    
+    Args:
+        fetcher: GmailFetcher bound to the user's token
+        first_page: Message IDs from the first list page
+        more_pages: The rest of the list pages (see iter_email_id_pages)
+        semaphore: The user's concurrency limit (see semaphore_for)
+        force_refresh: Bypass the fetcher's email cache
+    
+    Yields:
+        One JSON-encoded EmailResponse per line
+    """
+    async def fetch_group(group_ids: list[str]) -> list[ExtractedEmail]:
+        async with semaphore:
+            return await fetcher.fetch_and_extract_metadata_batch(group_ids, force_refresh)
+    
+    # Every finished task (group fetches and the pager) lands in this queue
+    finished: asyncio.Queue[asyncio.Task] = asyncio.Queue()
+    tasks: list[asyncio.Task] = []
+    
+    def schedule(message_ids: list[str]):
+        for start in range(0, len(message_ids), STREAM_BATCH_SIZE):
+            task = asyncio.ensure_future(fetch_group(message_ids[start:start + STREAM_BATCH_SIZE]))
+            task.add_done_callback(finished.put_nowait)
+            tasks.append(task)
+    
+    async def schedule_remaining_pages():
+        async for message_ids in more_pages:
+            schedule(message_ids)
+    
+    schedule(first_page)
+    pager = asyncio.ensure_future(schedule_remaining_pages())
+    pager.add_done_callback(finished.put_nowait)
+    
+    try:
+        groups_done = 0
+        pager_done = False
+        
+        while not pager_done or groups_done < len(tasks):
+            task = await finished.get()
+            
+            if task is pager:
+                pager_done = True
+                task.result()
+                continue
+            
+            groups_done += 1
+            for extracted in task.result():
+                yield extract_email_to_ndjson_line(extracted)
+    except GmailAuthError:
+        # The token was revoked mid-stream; make the next request re-verify it
+        forget_token(fetcher.access_token)
+        logger.warning("Error streaming emails: Gmail rejected the access token")
+    except Exception as e:
+        # Headers are already sent, so the stream just ends early
+        logger.error("Error streaming emails: %s", e)
+    finally:
+        # Stop work that has not finished yet (e.g. the client went away)
+        pager.cancel()
+        for task in tasks:
+            task.cancel()
+
+
+def get_fetcher(token: str, client: httpx.AsyncClient) -> GmailFetcher:
+    """
+    Get the GmailFetcher for an access token, creating it if needed.
+    
+    Fetchers are cached per token with LRU eviction so consecutive calls
+    from the same user reuse the same instance.
+    
+    Args:
+        token: Validated Google access token
+        client: The app-wide async HTTP client
+        
+    Returns:
+        GmailFetcher bound to the token
+    """
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    fetcher = _fetcher_cache.get(cache_key)
+    
+    if fetcher is None:
+        fetcher = GmailFetcher(access_token=token, client=client)
+        _fetcher_cache[cache_key] = fetcher
+    
+    _fetcher_cache.move_to_end(cache_key)
+    if len(_fetcher_cache) > FETCHER_CACHE_MAX_SIZE:
+        # The client is shared, so evicted fetchers need no cleanup
+        _fetcher_cache.popitem(last=False)
+    
+    return fetcher
+
+
+def invalidate_applications_cache():
+    """Drop the cached applications list so the next read hits Supabase."""
+    global _applications_cache
+    _applications_cache = None
+
+
+def forget_token(token: str):
+    """
+    Drop every cached entry for a token that Gmail has rejected.
+    
+    A token can be revoked before its cached verification expires, so a
+    401 from Gmail forces the next request to go back to tokeninfo.
+    
+    Args:
+        token: The access token Gmail rejected
+    """
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    _token_cache.pop(cache_key, None)
+    _fetcher_cache.pop(cache_key, None)
+
+
+async def verify_google_token(
+    request: Request,
+    authorization: str = Header(...)
+) -> str:
     """
     Verify the Google OAuth token from the Authorization header.
     
     This is a dependency function that validates the Bearer token
-    by checking it against Google's tokeninfo endpoint.
+    by checking it against Google's tokeninfo endpoint, using the
+    app-wide HTTP client so connections are reused between requests.
+    Successful checks are cached for a few minutes so repeated requests
+    from the same client skip the round trip to Google.
     
     Args:
+        request: The incoming request (used to reach the shared HTTP client)
         authorization: The Authorization header value (e.g., "Bearer <token>")
         
     Returns:
@@ -204,21 +591,42 @@ async def verify_google_token(authorization: str = Header(...)) -> str:
         HTTPException: If token is missing, invalid, or expired
     """
     # Check that header has correct format
-    if not authorization.startswith("Bearer "):
+    # Over-long headers are rejected before any work is done on them
+    if not authorization.startswith("Bearer ") or len(authorization) > MAX_AUTH_HEADER_LENGTH:
         raise HTTPException(status_code=401, detail="Invalid authorization header")
     
-    # Extract the token
-    token = authorization.replace("Bearer ", "")
+    # Extract the token (only the leading prefix is removed)
+    token = authorization.removeprefix("Bearer ").strip()
+    
+    # Skip the Google call if this token was verified recently
+    # Tokens are hashed so raw credentials are never kept in memory
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.monotonic()
+    expires_at = _token_cache.get(cache_key)
+    if expires_at is not None and expires_at > now:
+        return token
     
     # Verify with Google's tokeninfo endpoint
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/oauth2/v1/tokeninfo",
-            params={"access_token": token}
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
+    response = await request.app.state.http_client.get(
+        "https://www.googleapis.com/oauth2/v1/tokeninfo",
+        params={"access_token": token},
+        timeout=TOKENINFO_TIMEOUT
+    )
+    
+    if response.status_code != 200:
+        _token_cache.pop(cache_key, None)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    # Never trust the token for longer than Google says it is valid
+    ttl = TOKEN_CACHE_TTL
+    expires_in = orjson.loads(response.content).get("expires_in")
+    if isinstance(expires_in, int):
+        ttl = min(ttl, expires_in)
+    
+    _token_cache[cache_key] = now + ttl
+    _token_cache.move_to_end(cache_key)
+    if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
     
     return token
 
@@ -237,86 +645,104 @@ async def root():
     return {"status": "ok", "service": "SyncApply API"}
 
 
-@app.get("/api/emails", response_model=list[EmailResponse])
+@app.get(
+    "/api/emails",
+    response_class=StreamingResponse,
+    responses={200: {
+        "description": "One EmailResponse JSON object per line (NDJSON)",
+        "content": {"application/x-ndjson": {}}
+    }}
+)
 async def get_emails(
-    query: str = "in:inbox",
-    max_results: int = 10,
+    request: Request,
+    query: str = Query("in:inbox", max_length=MAX_QUERY_LENGTH),
+    max_results: int = Query(10, ge=1, le=MAX_EMAILS_PER_REQUEST),
+    force_refresh: bool = False,
     token: str = Depends(verify_google_token)
 ):
     """
-    Fetch emails from Gmail with parallel processing.
+    Fetch emails from Gmail and stream them back as NDJSON.
     
     This endpoint retrieves emails matching the given query and returns
     them in a format suitable for display in the frontend. Emails are
-    fetched in parallel for improved performance.
+    fetched through Gmail's batch endpoint in small groups that run
+    concurrently, and each email is written to the response as soon as
+    its group arrives. The client sees the first emails after a single
+    batch round trip, and the server never holds the full list in memory.
     
     Args:
+        request: The incoming request (used to reach the shared HTTP client)
         query: Gmail search query (same syntax as Gmail search box)
                Examples:
                - "in:inbox" - All inbox emails
                - "from:company.com" - Emails from specific domain
                - "subject:application" - Emails with 'application' in subject
         max_results: Maximum number of emails to return (1-100)
+        force_refresh: Re-fetch every email instead of using cached copies
         token: Validated Google access token (injected by dependency)
         
     Returns:
-        List of EmailResponse objects
+        StreamingResponse with one EmailResponse JSON object per line
     """
     try:
         # Create fetcher with the validated token
-        fetcher = GmailFetcher(access_token=token)
-        
-        # Get list of message IDs matching the query
-        messages = fetcher.fetch_email_list(query=query, max_results=max_results)
-        
-        if not messages:
-            return []
+        fetcher = get_fetcher(token, request.app.state.http_client)
         
-        # Fetch all emails in parallel using thread pool
-        # This is much faster than fetching one at a time
-        loop = asyncio.get_event_loop()
-        tasks = [
-            loop.run_in_executor(THREAD_POOL, fetcher.fetch_and_extract_email, msg["id"])
-            for msg in messages
-        ]
-        extracted_emails = await asyncio.gather(*tasks)
-        
-        # Convert to response format
-        emails = [extract_email_to_response(e) for e in extracted_emails]
-        
-        return emails
+        # Get the first page of message IDs matching the query
+        # Later pages (if any) are listed while the first emails are fetched
+        pages = fetcher.iter_email_id_pages(query=query, max_results=max_results)
+        first_page = await anext(pages, [])
         
+    except GmailAuthError:
+        forget_token(token)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        stream_emails_as_ndjson(fetcher, first_page, pages, semaphore_for(token), force_refresh),
+        media_type="application/x-ndjson"
+    )
 
 
 @app.get("/api/emails/{email_id}", response_model=EmailResponse)
 async def get_email(
+    request: Request,
     email_id: str,
+    force_refresh: bool = False,
     token: str = Depends(verify_google_token)
 ):
     """
     Fetch a single email by its ID.
     
     Args:
+        request: The incoming request (used to reach the shared HTTP client)
         email_id: The Gmail message ID
+        force_refresh: Re-fetch the email instead of using a cached copy
         token: Validated Google access token (injected by dependency)
         
     Returns:
         EmailResponse with full email details
     """
     try:
-        fetcher = GmailFetcher(access_token=token)
-        extracted = fetcher.fetch_and_extract_email(email_id)
+        fetcher = get_fetcher(token, request.app.state.http_client)
+        async with semaphore_for(token):
+            extracted = await fetcher.fetch_and_extract_full(
+                email_id, need_attachments=False, force_refresh=force_refresh
+            )
         
         return extract_email_to_response(extracted)
         
+    except GmailAuthError:
+        forget_token(token)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/applications/save/{email_id}", response_model=SaveResult)
 async def save_application(
+    request: Request,
     email_id: str,
     token: str = Depends(verify_google_token)
 ):
@@ -329,6 +755,7 @@ async def save_application(
         3. Saves to Supabase if it's a job application
     
     Args:
+        request: The incoming request (used to reach the shared HTTP client)
         email_id: The Gmail message ID to process
         token: Validated Google access token (injected by dependency)
         
@@ -337,16 +764,21 @@ async def save_application(
     """
     try:
         # Fetch the email
-        fetcher = GmailFetcher(access_token=token)
-        extracted = fetcher.fetch_and_extract_email(email_id)
+        fetcher = get_fetcher(token, request.app.state.http_client)
+        async with semaphore_for(token):
+            extracted = await fetcher.fetch_and_extract_full(email_id, need_attachments=False)
         
         # Save to debug file (only in development)
-        save_email_for_debugging(extracted)
+        if not IS_PRODUCTION:
+            await save_email_for_debugging_async(extracted)
         
         # Save to database using singleton tracker (uses LLM extraction internally)
-        success = job_tracker.save_application(extracted)
+        # Supabase and the LLM are blocking calls, so they run in the thread pool
+        loop = asyncio.get_running_loop()
+        success = await loop.run_in_executor(THREAD_POOL, job_tracker.save_application, extracted)
         
         if success:
+            invalidate_applications_cache()
             return SaveResult(
                 success=True,
                 message="Application saved successfully"
@@ -357,33 +789,111 @@ async def save_application(
                 message="Application already exists or email is not a job application"
             )
             
+    except GmailAuthError:
+        forget_token(token)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/applications/save-batch", response_model=SaveBatchResult)
+async def save_applications_batch(
+    request: Request,
+    body: SaveBatchRequest,
+    token: str = Depends(verify_google_token)
+):
+    """
+    Process several emails and save the job applications to Supabase.
+    
+    All emails are fetched with Gmail batch requests, classified by the
+    LLM concurrently, and every new application is written in a single
+    bulk insert, instead of one full round trip per email.
+    
+    Args:
+        request: The incoming request (used to reach the shared HTTP client)
+        body: The Gmail message IDs to process
+        token: Validated Google access token (injected by dependency)
+    
+    Returns:
+        SaveBatchResult listing saved and skipped email IDs
+    """
+    try:
+        fetcher = get_fetcher(token, request.app.state.http_client)
+        async with semaphore_for(token):
+            raw_emails = await fetcher.fetch_email_details_batch(body.ids)
+        
+        # MIME decoding, Supabase and the LLM are blocking, so they run in the thread pool
+        loop = asyncio.get_running_loop()
+        saved = await loop.run_in_executor(THREAD_POOL, _extract_and_save_applications, raw_emails)
+        
+        if saved:
+            invalidate_applications_cache()
+        
+        saved_ids = set(saved)
+        return SaveBatchResult(
+            saved=saved,
+            skipped=[email_id for email_id in body.ids if email_id not in saved_ids]
+        )
+    
+    except GmailAuthError:
+        forget_token(token)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/applications", response_model=list[dict])
-async def get_applications():
+async def get_applications(request: Request):
     """
     Get all saved job applications from the database.
     
     This endpoint does not require authentication since viewing
     applications is not sensitive.
     
+    The response carries a weak ETag and a short Cache-Control max-age,
+    so browsers can reuse the list between page loads and revalidate it
+    with If-None-Match (answered with an empty 304 if nothing changed).
+    
+    The serialized list is also kept in memory for APPLICATIONS_CACHE_TTL
+    seconds, so bursts of requests share a single Supabase query.
+    
+    Args:
+        request: The incoming request (used to read If-None-Match)
+    
     Returns:
         List of application records from Supabase
     """
-    try:
-        # Use singleton tracker instead of creating new instance
-        applications = job_tracker.get_all_applications()
-        return applications
+    global _applications_cache
+    
+    now = time.monotonic()
+    if _applications_cache is not None and _applications_cache[0] > now:
+        _, body, etag = _applications_cache
+    else:
+        try:
+            # Use singleton tracker instead of creating new instance
+            # The Supabase client is synchronous, so query from the thread pool
+            loop = asyncio.get_running_loop()
+            applications = await loop.run_in_executor(THREAD_POOL, job_tracker.get_all_applications)
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        body = orjson.dumps(applications)
+        etag = 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        _applications_cache = (now + APPLICATIONS_CACHE_TTL, body, etag)
+    
+    cache_headers = {"ETag": etag, "Cache-Control": APPLICATIONS_CACHE_CONTROL}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    
+    return Response(body, media_type="application/json", headers=cache_headers)
 
 
 @app.post("/api/applications/process-latest", response_model=SaveResult)
 async def process_latest_email(
-    query: str = "in:inbox",
+    request: Request,
+    query: str = Query("in:inbox", max_length=MAX_QUERY_LENGTH),
     token: str = Depends(verify_google_token)
 ):
     """
@@ -393,6 +903,7 @@ async def process_latest_email(
     recent email without needing to fetch the email list first.
     
     Args:
+        request: The incoming request (used to reach the shared HTTP client)
         query: Gmail search query to find the email
         token: Validated Google access token (injected by dependency)
         
@@ -400,14 +911,19 @@ async def process_latest_email(
         SaveResult indicating success or failure
     """
     try:
-        fetcher = GmailFetcher(access_token=token)
-        extracted, _ = fetcher.fetch_latest_email_for_llm(query=query)
+        fetcher = get_fetcher(token, request.app.state.http_client)
+        async with semaphore_for(token):
+            extracted, _ = await fetcher.fetch_latest_email_for_llm(query=query)
         
         # Save to debug file (only in development)
-        save_email_for_debugging(extracted)
+        if not IS_PRODUCTION:
+            await save_email_for_debugging_async(extracted)
         
-        # Process and save using singleton tracker
-        success = job_tracker.save_application(extracted)
+        # Process and save using singleton tracker (blocking, so in the thread pool)
+        loop = asyncio.get_running_loop()
+        success = await loop.run_in_executor(THREAD_POOL, job_tracker.save_application, extracted)
+        if success:
+            invalidate_applications_cache()
         
         return SaveResult(
             success=success,
@@ -417,6 +933,9 @@ async def process_latest_email(
     except ValueError as e:
         # No emails found matching query
         raise HTTPException(status_code=404, detail=str(e))
+    except GmailAuthError:
+        forget_token(token)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -428,13 +947,27 @@ async def process_latest_email(
 if __name__ == "__main__":
     import uvicorn
     
-    print("=" * 50)
-    print("  SyncApply API Server")
-    print("=" * 50)
-    print()
-    print(f"Environment: {'Production' if IS_PRODUCTION else 'Development'}")
-    print("Starting server...")
-    print("API docs available at: http://localhost:8000/docs")
-    print()
+    # One logging setup for the app and uvicorn (log_config=None below keeps
+    # uvicorn from replacing it). Production only logs warnings and errors,
+    # which also skips the per-request access log lines.
+    logging.basicConfig(
+        level=logging.WARNING if IS_PRODUCTION else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    logger.info(
+        "SyncApply API starting env=%s docs=http://localhost:8000/docs",
+        "production" if IS_PRODUCTION else "development"
+    )
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools (from uvicorn[standard]) have much lower
+    # per-request overhead than the default asyncio loop and HTTP parser.
+    # The app is passed as an import string so multiple workers can be used.
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_config=None
+    )
@@ -15,7 +15,8 @@ The main classes are:
     - JobApplicationTracker: Saves applications to Supabase
 
 Usage (standalone):
-    python fetch_emails.py
+    python fetch_emails.py              # process the latest email
+    python fetch_emails.py --sync 500   # save applications from 500 emails
     
 Usage (as module):
     from fetch_emails import GmailFetcher, JobApplicationTracker
@@ -27,29 +28,45 @@ Usage (as module):
 
 import os
 import re
+import sys
+import time
+import asyncio
 import base64
+import logging
+import sqlite3
+import threading
 import webbrowser
 from html import unescape
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, AsyncIterator, ClassVar, Mapping, Optional
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs, urlencode
+from urllib.parse import urlparse, parse_qs, urlencode, quote
 
 import httpx
-from supabase import create_client, Client
+import orjson
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 
-from llm_evoke import extract_email_info_using_gemini
+from llm_evoke import extract_email_info_using_gemini, extract_email_info_batch, GEMINI_BATCH_SIZE
+from llm_cache import llm_cache
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Per-email progress and errors; the script or the API configures output
+logger = logging.getLogger(__name__)
+
+# Local SQLite file remembering which Gmail IDs are already in Supabase
+SEEN_EMAILS_DB = os.getenv("SEEN_EMAILS_DB", "seen_emails.db")
+
 
 # =============================================================================
 # DATA CLASS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedEmail:
     """
     Container for email data that has been processed for LLM consumption.
@@ -64,9 +81,12 @@ class ExtractedEmail:
         labels: List of Gmail labels (e.g., "INBOX", "UNREAD")
         snippet: Short preview of the email content
         headers: Dictionary of email headers (From, To, Subject, Date, etc.)
+        subject: The Subject header (None if missing)
+        sender: The From header (None if missing)
+        date: The Date header (None if missing)
         body_text: The best available text representation of the email body
         body_plain: Plain text version of the body (if available)
-        body_html: HTML version of the body (if available)
+        body_html: Raw HTML bytes of the body (if available and requested)
         attachments: List of attachment metadata (filename, size, mime type)
         inline_images: List of inline image metadata
     """
@@ -75,9 +95,12 @@ class ExtractedEmail:
     labels: list
     snippet: str
     headers: dict
+    subject: Optional[str]
+    sender: Optional[str]
+    date: Optional[str]
     body_text: str
     body_plain: str
-    body_html: str
+    body_html: bytes
     attachments: list
     inline_images: list
 
@@ -86,29 +109,37 @@ class ExtractedEmail:
 # HELPER FUNCTIONS
 # =============================================================================
 
-def decode_base64_content(encoded_data: str) -> str:
+def decode_base64_content(encoded_data: str) -> bytes:
     """
     Decode base64-encoded email content from Gmail.
     
     Gmail API returns email body content in base64url encoding. This function
-    handles the decoding process safely, returning an empty string if decoding
-    fails for any reason.
+    handles the decoding process safely, returning empty bytes if decoding
+    fails for any reason. The result is left as bytes so HTML bodies can be
+    stripped before paying for a UTF-8 decode.
     
     Args:
         encoded_data: The base64url-encoded string from Gmail API
         
     Returns:
-        Decoded string content, or empty string if decoding fails
+        Decoded raw bytes, or empty bytes if decoding fails
     """
     try:
         # Gmail uses URL-safe base64 encoding
-        decoded_bytes = base64.urlsafe_b64decode(encoded_data)
-        return decoded_bytes.decode('utf-8', errors='ignore')
+        return base64.urlsafe_b64decode(encoded_data)
     except Exception:
-        return ""
+        return b""
 
 
-def convert_html_to_plain_text(html_content: str) -> str:
+# Patterns for convert_html_to_plain_text, compiled once at import time
+# Style and script blocks are dropped with their contents, in a single pass
+# Markup is stripped from the raw bytes, before the UTF-8 decode
+_RE_STYLE_SCRIPT = re.compile(rb'<(style|script)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_RE_TAG = re.compile(rb'<[^>]+>')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+
+def convert_html_to_plain_text(html_content: bytes) -> str:
     """
     Convert HTML email content to plain text.
     
@@ -117,36 +148,23 @@ def convert_html_to_plain_text(html_content: str) -> str:
     to their character equivalents.
     
     Args:
-        html_content: Raw HTML string from the email body
+        html_content: Raw UTF-8 HTML bytes from the email body
         
     Returns:
         Clean plain text with HTML tags and scripts removed
     """
-    # Step 1: Remove style blocks (CSS that would clutter the output)
-    text = re.sub(
-        r'<style[^>]*>.*?</style>', 
-        '', 
-        html_content, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    # Step 1: Remove style and script blocks (CSS and JavaScript)
+    stripped = _RE_STYLE_SCRIPT.sub(b'', html_content)
     
-    # Step 2: Remove script blocks (JavaScript)
-    text = re.sub(
-        r'<script[^>]*>.*?</script>', 
-        '', 
-        text, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    
-    # Step 3: Remove all remaining HTML tags
-    text = re.sub(r'<[^>]+>', ' ', text)
+    # Step 2: Remove all remaining HTML tags
+    stripped = _RE_TAG.sub(b' ', stripped)
     
-    # Step 4: Convert HTML entities (e.g., &amp; -> &, &nbsp; -> space)
-    text = unescape(text)
+    # Step 3: Decode only the remaining text, then convert HTML entities
+    # (e.g., &amp; -> &, &nbsp; -> space)
+    text = unescape(stripped.decode('utf-8', errors='ignore'))
     
-    # Step 5: Clean up excessive whitespace
-    text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
-    text = re.sub(r'\n\s*\n', '\n\n', text)  # Normalize blank lines
+    # Step 4: Collapse all whitespace (newlines included) to single spaces
+    text = _RE_WHITESPACE.sub(' ', text)
     
     return text.strip()
 
@@ -155,24 +173,35 @@ def convert_html_to_plain_text(html_content: str) -> str:
 # EMAIL EXTRACTION
 # =============================================================================
 
-def extract_email_content(raw_gmail_response: dict) -> ExtractedEmail:
+# Headers kept from each email; the most useful for understanding its context
+USEFUL_HEADERS = frozenset({"From", "To", "Cc", "Bcc", "Subject", "Date", "Reply-To"})
+
+
+def extract_email_content(
+    raw_gmail_response: dict, need_attachments: bool = True, need_html: bool = True
+) -> ExtractedEmail:
     """
     Extract useful content from a raw Gmail API response.
     
     The Gmail API returns emails in a complex nested structure with MIME parts.
-    This function recursively processes all parts to extract the plain text body,
-    HTML body, and any attachments.
+    This function walks all parts to extract the plain text body, HTML body,
+    and any attachments. The first plain text and HTML parts found win.
     
     Args:
         raw_gmail_response: The raw JSON response from Gmail API messages.get()
+        need_attachments: Collect attachment metadata. When False, the walk
+            stops as soon as both bodies have been found.
+        need_html: Fill body_html. When False, the HTML part is only
+            decoded if there is no plain text part to build body_text from,
+            and body_html is left empty.
         
     Returns:
         ExtractedEmail object with all content properly extracted
     """
     # Initialize containers for extracted content
-    headers = {}
+    # The HTML part is kept base64-encoded until we know it is needed
     body_plain = None
-    body_html = None
+    html_data = None
     attachments = []
     inline_images = []
     
@@ -187,56 +216,55 @@ def extract_email_content(raw_gmail_response: dict) -> ExtractedEmail:
     raw_headers = payload.get("headers", [])
     
     # Extract only the headers we care about for job applications
-    # These are the most useful for understanding email context
-    useful_headers = ["From", "To", "Cc", "Bcc", "Subject", "Date", "Reply-To"]
-    for header in raw_headers:
-        if header["name"] in useful_headers:
-            headers[header["name"]] = header["value"]
+    headers = {
+        header["name"]: header["value"]
+        for header in raw_headers
+        if header["name"] in USEFUL_HEADERS
+    }
     
-    # Define a recursive function to process MIME parts
+    # Walk the MIME tree depth-first with an explicit stack
     # Emails can have deeply nested multipart structures
-    def process_mime_part(part: dict):
-        """Process a single MIME part and its nested children."""
-        nonlocal body_plain, body_html, attachments, inline_images
-        
+    stack = [payload]
+    while stack:
+        part = stack.pop()
         mime_type = part.get("mimeType", "")
-        filename = part.get("filename", "")
-        body_data = part.get("body", {})
+        body_data = part.get("body") or {}
         
         # Check if this part is an attachment (has a filename)
-        if filename:
-            attachment_info = {
-                "filename": filename,
-                "mime_type": mime_type,
-                "size": body_data.get("size", 0),
-                "attachment_id": body_data.get("attachmentId", ""),
-            }
-            
-            # Separate large images (likely inline) from regular attachments
-            is_image = mime_type.startswith("image/")
-            is_large = body_data.get("size", 0) > 5000
-            
-            if is_image and is_large:
-                inline_images.append(attachment_info)
-            else:
-                attachments.append(attachment_info)
+        if part.get("filename"):
+            if need_attachments:
+                size = body_data.get("size", 0)
+                attachment_info = {
+                    "filename": part["filename"],
+                    "mime_type": mime_type,
+                    "size": size,
+                    "attachment_id": body_data.get("attachmentId", ""),
+                }
+                
+                # Separate large images (likely inline) from regular attachments
+                if mime_type.startswith("image/") and size > 5000:
+                    inline_images.append(attachment_info)
+                else:
+                    attachments.append(attachment_info)
         
-        # Check if this part has body content (no filename, has data)
+        # Body content (no filename, has data); only decode the first of each
         elif body_data.get("data"):
-            decoded = decode_base64_content(body_data["data"])
+            if mime_type == "text/plain" and body_plain is None:
+                body_plain = decode_base64_content(body_data["data"]).decode('utf-8', errors='ignore')
+            elif mime_type == "text/html" and html_data is None:
+                html_data = body_data["data"]
             
-            # Store plain text and HTML versions separately
-            if mime_type == "text/plain":
-                body_plain = decoded
-            elif mime_type == "text/html":
-                body_html = decoded
+            if body_plain is not None and html_data is not None and not need_attachments:
+                break
         
-        # Recursively process any nested parts (multipart emails)
-        for sub_part in part.get("parts", []):
-            process_mime_part(sub_part)
+        # Push children in reverse so they are visited in document order
+        sub_parts = part.get("parts")
+        if sub_parts:
+            stack.extend(reversed(sub_parts))
     
-    # Start processing from the top-level payload
-    process_mime_part(payload)
+    body_html = None
+    if html_data and (need_html or not body_plain):
+        body_html = decode_base64_content(html_data)
     
     # Determine the best body text to use
     # Prefer plain text, fall back to converted HTML, then snippet
@@ -244,6 +272,8 @@ def extract_email_content(raw_gmail_response: dict) -> ExtractedEmail:
         body_text = body_plain
     elif body_html:
         body_text = convert_html_to_plain_text(body_html)
+        if not need_html:
+            body_html = None
     else:
         body_text = snippet
     
@@ -253,14 +283,80 @@ def extract_email_content(raw_gmail_response: dict) -> ExtractedEmail:
         labels=labels,
         snippet=snippet,
         headers=headers,
+        subject=headers.get("Subject"),
+        sender=headers.get("From"),
+        date=headers.get("Date"),
         body_text=body_text,
         body_plain=body_plain or "",
-        body_html=body_html or "",
+        body_html=body_html or b"",
         attachments=attachments,
         inline_images=inline_images,
     )
 
 
+def extract_email_metadata(raw_gmail_response: dict) -> ExtractedEmail:
+    """
+    Extract headers and snippet from a Gmail API "metadata" response.
+    
+    Metadata responses carry no body parts, so there is no MIME tree to walk.
+    The snippet stands in for the body text, which is all the email list needs.
+    
+    Args:
+        raw_gmail_response: The raw JSON response from messages.get(format=metadata)
+    
+    Returns:
+        ExtractedEmail object with empty body and attachment fields
+    """
+    snippet = raw_gmail_response.get("snippet", "")
+    raw_headers = raw_gmail_response.get("payload", {}).get("headers", [])
+    
+    headers = {header["name"]: header["value"] for header in raw_headers}
+    
+    return ExtractedEmail(
+        id=raw_gmail_response.get("id", ""),
+        thread_id=raw_gmail_response.get("threadId", ""),
+        labels=raw_gmail_response.get("labelIds", []),
+        snippet=snippet,
+        headers=headers,
+        subject=headers.get("Subject"),
+        sender=headers.get("From"),
+        date=headers.get("Date"),
+        body_text=snippet,
+        body_plain="",
+        body_html=b"",
+        attachments=[],
+        inline_images=[],
+    )
+
+
+# Separator line around the LLM-formatted email
+SECTION_BAR = "=" * 50
+
+# Headers included in the LLM-formatted email, in this order
+LLM_METADATA_HEADERS = ("From", "To", "Cc", "Date", "Subject")
+
+
+def _format_file_section(title: str, files: list) -> str:
+    """
+    Format a list of attachment or image metadata for format_email_for_llm.
+    
+    Args:
+        title: Section title (e.g. "ATTACHMENTS")
+        files: Attachment metadata dicts with filename, mime_type and size
+    
+    Returns:
+        The section text ending in a blank line, or "" if files is empty
+    """
+    if not files:
+        return ""
+    
+    entries = "".join(
+        f"- {f['filename']} ({f['mime_type']}, {f['size'] / 1024:.1f} KB)\n"
+        for f in files
+    )
+    return f"--- {title} ---\n{entries}\n"
+
+
 def format_email_for_llm(email: ExtractedEmail) -> str:
     """
     Format an extracted email as clean text for LLM processing.
@@ -275,46 +371,33 @@ def format_email_for_llm(email: ExtractedEmail) -> str:
     Returns:
         A formatted string suitable for sending to an LLM
     """
-    lines = []
+    # Metadata section - key headers for understanding context
+    metadata = "".join(
+        f"{key}: {email.headers[key]}\n"
+        for key in LLM_METADATA_HEADERS
+        if key in email.headers
+    )
     
-    # Header section
-    lines.append("=" * 50)
-    lines.append("EMAIL CONTENT")
-    lines.append("=" * 50)
-    lines.append("")
+    # Attachments and images sections (only if present)
+    attachments = _format_file_section("ATTACHMENTS", email.attachments)
+    images = _format_file_section("IMAGES", email.inline_images)
     
-    # Metadata section - key headers for understanding context
-    lines.append("--- METADATA ---")
-    for key in ["From", "To", "Cc", "Date", "Subject"]:
-        if key in email.headers:
-            lines.append(f"{key}: {email.headers[key]}")
-    lines.append(f"Labels: {', '.join(email.labels)}")
-    lines.append("")
-    
-    # Body section - the main email content
-    lines.append("--- BODY ---")
-    lines.append(email.body_text if email.body_text else "(No body content)")
-    lines.append("")
-    
-    # Attachments section (if any)
-    if email.attachments:
-        lines.append("--- ATTACHMENTS ---")
-        for att in email.attachments:
-            size_kb = att["size"] / 1024
-            lines.append(f"- {att['filename']} ({att['mime_type']}, {size_kb:.1f} KB)")
-        lines.append("")
-    
-    # Images section (if any)
-    if email.inline_images:
-        lines.append("--- IMAGES ---")
-        for img in email.inline_images:
-            size_kb = img["size"] / 1024
-            lines.append(f"- {img['filename']} ({img['mime_type']}, {size_kb:.1f} KB)")
-        lines.append("")
-    
-    lines.append("=" * 50)
-    
-    return "\n".join(lines)
+    return (
+        f"{SECTION_BAR}\n"
+        "EMAIL CONTENT\n"
+        f"{SECTION_BAR}\n"
+        "\n"
+        "--- METADATA ---\n"
+        f"{metadata}"
+        f"Labels: {', '.join(email.labels)}\n"
+        "\n"
+        "--- BODY ---\n"
+        f"{email.body_text or '(No body content)'}\n"
+        "\n"
+        f"{attachments}"
+        f"{images}"
+        f"{SECTION_BAR}"
+    )
 
 
 # =============================================================================
@@ -338,11 +421,30 @@ class GmailAuthenticator:
         3. Extracting the provider_token from the callback URL
         4. Saving the token for future use
     
+    Validated tokens are remembered in memory for a few minutes, so
+    repeated authenticate() calls skip the file read and the Google check.
+    The token file also records when the token was obtained; Google access
+    tokens live for an hour, so for most of that hour a fresh start trusts
+    the saved token without asking Google either.
+    
     Attributes:
+        TOKEN_MEMORY_TTL: Seconds a validated token is trusted without re-checking
+        TOKEN_FILE_TTL: Seconds after login a saved token is trusted without re-checking
+        OAUTH_CALLBACK_TIMEOUT: Seconds to wait for the browser sign-in to finish
         token_file: Path to file where token is stored
         access_token: Current access token (if authenticated)
     """
     
+    TOKEN_MEMORY_TTL = 300
+    TOKEN_FILE_TTL = 3000
+    OAUTH_CALLBACK_TIMEOUT = 120
+    
+    # Validated tokens shared by all instances: token_file -> (token, monotonic expiry)
+    _token_memory: ClassVar[dict[str, tuple[str, float]]] = {}
+    
+    # Keep-alive client for tokeninfo checks, created on first use
+    _http_client: ClassVar[Optional[httpx.Client]] = None
+    
     def __init__(self, token_file: str = "gmail_token.txt"):
         """
         Initialize the authenticator.
@@ -381,11 +483,13 @@ class GmailAuthenticator:
         Returns:
             True if token is valid, False otherwise
         """
+        if GmailAuthenticator._http_client is None:
+            GmailAuthenticator._http_client = httpx.Client(http2=True, timeout=10.0)
+        
         try:
-            response = httpx.get(
+            response = GmailAuthenticator._http_client.get(
                 'https://www.googleapis.com/oauth2/v1/tokeninfo',
-                params={'access_token': token},
-                timeout=10.0
+                params={'access_token': token}
             )
             return response.status_code == 200
         except httpx.RequestError:
@@ -396,18 +500,36 @@ class GmailAuthenticator:
         Load and validate a previously saved token.
         
         Checks if a token file exists, reads it, and validates that
-        the token is still valid with Google.
+        the token is still valid with Google. Tokens saved less than
+        TOKEN_FILE_TTL seconds ago are used without the Google check.
         
         Returns:
             Valid token string, or None if no valid token exists
         """
+        # Skip the disk and the Google check if this token was validated recently
+        remembered = self._token_memory.get(self.token_file)
+        if remembered and remembered[1] > time.monotonic():
+            return remembered[0]
+        
         if not os.path.exists(self.token_file):
             return None
         
-        with open(self.token_file, 'r') as f:
-            token = f.read().strip()
+        with open(self.token_file, 'rb') as f:
+            content = f.read()
+        
+        # Token files from older versions hold just the token
+        try:
+            saved = orjson.loads(content)
+            token, saved_at = saved["token"], saved["saved_at"]
+        except (ValueError, KeyError, TypeError):
+            token, saved_at = content.decode('utf-8', errors='ignore').strip(), 0.0
+        
+        if token and time.time() - saved_at < self.TOKEN_FILE_TTL:
+            self._remember_token(token)
+            return token
         
         if token and self.is_token_valid(token):
+            self._remember_token(token)
             return token
         
         print("Saved token expired or invalid.")
@@ -415,13 +537,44 @@ class GmailAuthenticator:
     
     def save_token(self, token: str):
         """
-        Save a token to the token file.
+        Save a freshly obtained token to the token file.
+        
+        The token is stored as JSON together with the time it was saved
+        (see TOKEN_FILE_TTL). The file is created readable and writable by
+        the owner only, since it holds a live credential.
         
         Args:
             token: The access token to save
         """
-        with open(self.token_file, 'w') as f:
-            f.write(token)
+        fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({"token": token, "saved_at": time.time()}))
+        
+        self._remember_token(token)
+    
+    def _remember_token(self, token: str):
+        """
+        Remember a validated token in memory for TOKEN_MEMORY_TTL seconds.
+        
+        Args:
+            token: The access token to remember
+        """
+        self._token_memory[self.token_file] = (token, time.monotonic() + self.TOKEN_MEMORY_TTL)
+    
+    def forget_token(self):
+        """
+        Drop the saved token, so the next authenticate() logs in again.
+        
+        Used when Gmail rejects a token that was trusted without the
+        Google check (e.g. one revoked before TOKEN_FILE_TTL ran out).
+        """
+        self._token_memory.pop(self.token_file, None)
+        self.access_token = None
+        
+        try:
+            os.remove(self.token_file)
+        except FileNotFoundError:
+            pass
     
     def run_oauth_flow(self) -> str:
         """
@@ -435,8 +588,12 @@ class GmailAuthenticator:
         
         Returns:
             The Google access token from the OAuth flow
+        
+        Raises:
+            TimeoutError: If no callback arrives within OAUTH_CALLBACK_TIMEOUT
         """
         captured_token = None
+        token_ready = threading.Event()
         
         class OAuthCallbackHandler(BaseHTTPRequestHandler):
             """HTTP handler to receive the OAuth callback."""
@@ -452,6 +609,7 @@ class GmailAuthenticator:
                 if 'provider_token' in params:
                     # Token received! Send success page and store token
                     captured_token = params['provider_token'][0]
+                    token_ready.set()
                     self.send_response(200)
                     self.send_header('Content-type', 'text/html')
                     self.end_headers()
@@ -492,15 +650,20 @@ class GmailAuthenticator:
                 """Suppress default HTTP server logging."""
                 pass
         
-        # Open browser and wait for callback
-        print("Opening browser for Google sign-in...")
-        webbrowser.open(self.get_oauth_url())
-        
-        # Start local server to receive the callback
+        # Start local server first so the callback can never arrive too early
         server = HTTPServer(('localhost', 3000), OAuthCallbackHandler)
-        while captured_token is None:
-            server.handle_request()
-        server.server_close()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        # Open browser and sleep until the handler signals the token
+        try:
+            print("Opening browser for Google sign-in...")
+            webbrowser.open(self.get_oauth_url())
+            
+            if not token_ready.wait(timeout=self.OAUTH_CALLBACK_TIMEOUT):
+                raise TimeoutError("Timed out waiting for the Google sign-in callback")
+        finally:
+            server.shutdown()
+            server.server_close()
         
         return captured_token
     
@@ -537,6 +700,47 @@ class GmailAuthenticator:
 # GMAIL FETCHER
 # =============================================================================
 
+class GmailAuthError(Exception):
+    """Raised when Gmail rejects the access token (HTTP 401)."""
+
+
+# Fields read from each MIME part (nested parts' own headers are never used)
+MIME_PART_FIELDS = "mimeType,filename,body(size,attachmentId,data)"
+
+# MIME nesting levels that are trimmed to MIME_PART_FIELDS; anything deeper
+# is returned in full, so unusually nested bodies are never lost
+MIME_MASK_DEPTH = 4
+
+
+def build_parts_field_mask(depth: int) -> str:
+    """
+    Build the partial-response mask for nested MIME parts.
+    
+    Args:
+        depth: Number of nesting levels to trim
+    
+    Returns:
+        A Gmail "fields" expression selecting the parts tree
+    """
+    if depth == 0:
+        return "parts"
+    return f"parts({MIME_PART_FIELDS},{build_parts_field_mask(depth - 1)})"
+
+
+# Partial-response masks, so Gmail only sends the fields we actually read
+FULL_MESSAGE_FIELDS = (
+    f"id,threadId,labelIds,snippet,"
+    f"payload(headers,{MIME_PART_FIELDS},{build_parts_field_mask(MIME_MASK_DEPTH)})"
+)
+METADATA_MESSAGE_FIELDS = "id,threadId,labelIds,snippet,payload/headers"
+MESSAGE_LIST_FIELDS = "messages(id,threadId),nextPageToken"
+
+# Patterns for reading multipart batch responses, compiled once at import time
+_RE_BATCH_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+_RE_BATCH_STATUS = re.compile(r"HTTP/\S+ (\d{3})\b")
+_RE_BATCH_CONTENT_ID = re.compile(r"Content-ID:\s*<response-(\d+)>", re.IGNORECASE)
+
+
 class GmailFetcher:
     """
     Fetches emails from Gmail API.
@@ -545,25 +749,104 @@ class GmailFetcher:
     email lists and individual email details. It uses the access token
     from GmailAuthenticator.
     
+    All network methods are async. The fetcher can share an app-wide
+    httpx.AsyncClient, so TCP/TLS setup is paid once and HTTP/2 multiplexes
+    concurrent requests over a single connection to Google.
+    
+    Extracted emails are cached per fetcher (and so per token). Delivered
+    Gmail messages never change, so repeat views skip the Gmail call.
+    
     Attributes:
         GMAIL_API_BASE: Base URL for Gmail API endpoints
+        GMAIL_BATCH_URL: Endpoint for multipart batch requests
+        GMAIL_BATCH_LIMIT: Maximum sub-requests Gmail accepts per batch
+        GMAIL_LIST_PAGE_LIMIT: Maximum message IDs Gmail returns per list page
+        MAX_CONCURRENT_REQUESTS: Maximum Gmail requests this fetcher has in flight
+        METADATA_HEADERS: Headers requested when only metadata is needed
+        EMAIL_CACHE_TTL: Seconds an extracted email is reused
+        EMAIL_CACHE_MAX_SIZE: Maximum extracted emails kept per fetcher
         access_token: Google access token with Gmail scope
         headers: HTTP headers including Authorization
+        client: Async HTTP client used for all Gmail requests
     """
     
     GMAIL_API_BASE = "https://www.googleapis.com/gmail/v1/users/me"
+    GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+    GMAIL_BATCH_LIMIT = 100
+    GMAIL_LIST_PAGE_LIMIT = 500
+    MAX_CONCURRENT_REQUESTS = 16
+    BATCH_BOUNDARY = "batch_syncapply"
+    METADATA_HEADERS = ["From", "Subject", "Date"]
+    EMAIL_CACHE_TTL = 3600
+    EMAIL_CACHE_MAX_SIZE = 200
     
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the fetcher with an access token.
         
         Args:
             access_token: Valid Google access token with Gmail read scope
+            client: Shared async HTTP client. If not given, the fetcher
+                    creates (and owns) its own client.
         """
         self.access_token = access_token
-        self.headers = {"Authorization": f"Bearer {access_token}"}
+        
+        # Google only compresses API responses when the User-Agent also
+        # contains "gzip"; httpx decompresses the body transparently
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "SyncApply/1.0 (gzip)",
+        }
+        
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(http2=True, timeout=30.0)
+        
+        # Caps concurrent Gmail calls, however many batches callers gather
+        self._request_slots = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        # In-flight single-message fetches: (message_id, metadata_only) -> task
+        # Concurrent requests for the same message share one Gmail call
+        self._inflight: dict[tuple[str, bool], asyncio.Task] = {}
+        
+        # Extracted emails: (message_id, kind) -> (monotonic expiry, email)
+        # Kept in insertion order so the oldest entries can be evicted first
+        self._email_cache: OrderedDict[tuple[str, str], tuple[float, ExtractedEmail]] = OrderedDict()
+    
+    async def aclose(self):
+        """Close the HTTP client, unless it is shared and owned by the caller."""
+        if self._owns_client:
+            await self.client.aclose()
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a Gmail API request once a concurrency slot is free.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed through to httpx.AsyncClient.request
+        
+        Returns:
+            The HTTP response
+        """
+        async with self._request_slots:
+            return await self.client.request(method, url, **kwargs)
     
-    def fetch_email_list(self, query: str = "in:inbox", max_results: int = 10) -> list[dict]:
+    def _check_auth(self, response: httpx.Response):
+        """
+        Raise GmailAuthError if Gmail rejected the access token.
+        
+        Args:
+            response: Any response from the Gmail API
+        
+        Raises:
+            GmailAuthError: If the response status is 401
+        """
+        if response.status_code == 401:
+            raise GmailAuthError("Gmail rejected the access token")
+    
+    async def fetch_email_list(self, query: str = "in:inbox", max_results: int = 10) -> list[dict]:
         """
         Get a list of email IDs matching a search query.
         
@@ -574,53 +857,456 @@ class GmailFetcher:
             
         Returns:
             List of dicts with 'id' and 'threadId' keys
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
+        """
+        messages, _ = await self.fetch_email_list_page(query, max_results)
+        return messages
+    
+    async def fetch_email_list_page(
+        self, query: str, max_results: int, page_token: Optional[str] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Get one page of email IDs matching a search query.
+        
+        Args:
+            query: Gmail search query (same syntax as Gmail search box)
+            max_results: Maximum number of emails on this page (1-500)
+            page_token: nextPageToken from the previous page, if any
+        
+        Returns:
+            Tuple of (list of dicts with 'id' and 'threadId' keys,
+            token for the next page or None if this is the last one)
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
         """
         url = f"{self.GMAIL_API_BASE}/messages"
-        params = {"maxResults": max_results, "q": query}
+        params = {"maxResults": max_results, "q": query, "fields": MESSAGE_LIST_FIELDS}
+        if page_token:
+            params["pageToken"] = page_token
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, headers=self.headers, params=params)
-            data = response.json()
-            
-            if "error" in data:
-                print(f"Error fetching emails: {data['error']['message']}")
-                return []
+        response = await self._request("GET", url, headers=self.headers, params=params)
+        self._check_auth(response)
+        data = orjson.loads(response.content)
+        
+        if "error" in data:
+            logger.warning("Error fetching emails: %s", data['error']['message'])
+            return [], None
+        
+        return data.get("messages", []), data.get("nextPageToken")
+    
+    async def iter_email_id_pages(self, query: str, max_results: int) -> AsyncIterator[list[str]]:
+        """
+        Yield the IDs of emails matching a query, one list page at a time.
+        
+        Follows nextPageToken until max_results IDs have been yielded, so
+        callers can start fetching each page's emails while the next page
+        is still being listed.
+        
+        Args:
+            query: Gmail search query (same syntax as Gmail search box)
+            max_results: Total number of email IDs to yield
+        
+        Yields:
+            Lists of Gmail message IDs, in Gmail's order
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
+        """
+        remaining = max_results
+        page_token = None
+        
+        while remaining > 0:
+            messages, page_token = await self.fetch_email_list_page(
+                query, min(remaining, self.GMAIL_LIST_PAGE_LIMIT), page_token
+            )
+            if messages:
+                yield [message["id"] for message in messages]
             
-            return data.get("messages", [])
+            remaining -= len(messages)
+            if not messages or not page_token:
+                return
+    
+    def _message_params(self, metadata_only: bool) -> list[tuple[str, str]]:
+        """
+        Build the query parameters for a messages.get call.
+        
+        Args:
+            metadata_only: Request only the METADATA_HEADERS instead of the
+                full MIME tree with base64 bodies
+        
+        Returns:
+            List of (name, value) query parameters
+        """
+        if not metadata_only:
+            return [("format", "full"), ("fields", FULL_MESSAGE_FIELDS)]
+        
+        return [("format", "metadata"), ("fields", METADATA_MESSAGE_FIELDS)] + [
+            ("metadataHeaders", header) for header in self.METADATA_HEADERS
+        ]
     
-    def fetch_email_details(self, message_id: str) -> dict:
+    async def fetch_email_details(self, message_id: str, metadata_only: bool = False) -> dict:
         """
-        Get the full details of a single email by its ID.
+        Get the details of a single email by its ID.
+        
+        If the same message is already being fetched (e.g. a double-clicked
+        save button), this waits for that request instead of sending another.
         
         Args:
             message_id: The Gmail message ID
+            metadata_only: Fetch only From/Subject/Date and the snippet
             
         Returns:
-            Full email data from Gmail API
+            Email data from Gmail API
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
+        """
+        key = (message_id, metadata_only)
+        task = self._inflight.get(key)
+        
+        if task is None:
+            task = asyncio.ensure_future(self._get_message(message_id, metadata_only))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so one caller giving up does not cancel the others
+        return await asyncio.shield(task)
+    
+    async def _get_message(self, message_id: str, metadata_only: bool) -> dict:
+        """
+        Send the messages.get request for fetch_email_details.
+        
+        Args:
+            message_id: The Gmail message ID
+            metadata_only: Fetch only From/Subject/Date and the snippet
+        
+        Returns:
+            Email data from Gmail API
         """
         url = f"{self.GMAIL_API_BASE}/messages/{message_id}"
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, headers=self.headers, params={"format": "full"})
-            return response.json()
+        response = await self._request(
+            "GET", url, headers=self.headers, params=self._message_params(metadata_only)
+        )
+        self._check_auth(response)
+        return orjson.loads(response.content)
     
-    def fetch_and_extract_email(self, message_id: str) -> ExtractedEmail:
+    def _cache_get(self, key: tuple[str, str]) -> Optional[ExtractedEmail]:
+        """
+        Look up an extracted email, dropping it if it has expired.
+        
+        Args:
+            key: (message_id, kind) cache key
+        
+        Returns:
+            The cached ExtractedEmail, or None on a miss
         """
-        Fetch an email and extract it for processing.
+        entry = self._email_cache.get(key)
+        if entry is None:
+            return None
+        
+        if entry[0] <= time.monotonic():
+            del self._email_cache[key]
+            return None
+        
+        self._email_cache.move_to_end(key)
+        return entry[1]
+    
+    def _cache_put(self, key: tuple[str, str], email: ExtractedEmail):
+        """
+        Store an extracted email, evicting the least recently used if full.
+        
+        Args:
+            key: (message_id, kind) cache key
+            email: The extracted email to cache
+        """
+        # Messages Gmail failed to return come back empty; never cache those
+        if not email.id:
+            return
+        
+        self._email_cache[key] = (time.monotonic() + self.EMAIL_CACHE_TTL, email)
+        self._email_cache.move_to_end(key)
+        if len(self._email_cache) > self.EMAIL_CACHE_MAX_SIZE:
+            self._email_cache.popitem(last=False)
+    
+    async def fetch_and_extract_full(
+        self, message_id: str, need_attachments: bool = True, force_refresh: bool = False
+    ) -> ExtractedEmail:
+        """
+        Fetch an email with its full body and extract it for processing.
         
         Combines fetch_email_details and extract_email_content into
         a single convenient method.
         
         Args:
             message_id: The Gmail message ID
+            need_attachments: Collect attachment metadata and the raw HTML body.
+                When False, only what body_text needs is extracted.
+            force_refresh: Ignore any cached copy and fetch from Gmail
             
         Returns:
             ExtractedEmail object ready for LLM processing
         """
-        raw_email = self.fetch_email_details(message_id)
-        return extract_email_content(raw_email)
+        key = (message_id, "full" if need_attachments else "body")
+        email = None if force_refresh else self._cache_get(key)
+        
+        if email is None:
+            raw_email = await self.fetch_email_details(message_id)
+            email = extract_email_content(raw_email, need_attachments, need_html=need_attachments)
+            self._cache_put(key, email)
+        
+        return email
+    
+    async def fetch_and_extract_metadata(self, message_id: str, force_refresh: bool = False) -> ExtractedEmail:
+        """
+        Fetch only the headers and snippet of an email.
+        
+        Much smaller than a full fetch; use it wherever the body is not needed.
+        
+        Args:
+            message_id: The Gmail message ID
+            force_refresh: Ignore any cached copy and fetch from Gmail
+        
+        Returns:
+            ExtractedEmail object with the snippet as body_text
+        """
+        key = (message_id, "metadata")
+        email = None if force_refresh else self._cache_get(key)
+        
+        if email is None:
+            raw_email = await self.fetch_email_details(message_id, metadata_only=True)
+            email = extract_email_metadata(raw_email)
+            self._cache_put(key, email)
+        
+        return email
+    
+    async def fetch_email_details_batch(
+        self, message_ids: list[str], metadata_only: bool = False
+    ) -> list[dict]:
+        """
+        Get the full details of several emails using Gmail's batch endpoint.
+        
+        Instead of one HTTPS request per message, the GETs are packed into
+        a single multipart/mixed request (up to GMAIL_BATCH_LIMIT per call),
+        which saves a full round trip for every additional email. Larger
+        lists are split into several batches that are sent concurrently.
+        
+        Args:
+            message_ids: Gmail message IDs to fetch
+            metadata_only: Fetch only From/Subject/Date and the snippet
+        
+        Returns:
+            List of Gmail message dicts, in the same order as message_ids
+            (an empty dict for any message Gmail did not return)
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
+        """
+        # Gmail accepts at most GMAIL_BATCH_LIMIT sub-requests per batch
+        chunks = [
+            message_ids[start:start + self.GMAIL_BATCH_LIMIT]
+            for start in range(0, len(message_ids), self.GMAIL_BATCH_LIMIT)
+        ]
+        responses = await asyncio.gather(*(
+            self._request(
+                "POST",
+                self.GMAIL_BATCH_URL,
+                headers={
+                    **self.headers,
+                    "Content-Type": f"multipart/mixed; boundary={self.BATCH_BOUNDARY}",
+                },
+                content=self._build_batch_body(chunk, metadata_only),
+            )
+            for chunk in chunks
+        ))
+        
+        raw_emails = []
+        for chunk, response in zip(chunks, responses):
+            self._check_auth(response)
+            raw_emails.extend(self._parse_batch_response(response, len(chunk)))
+        
+        return raw_emails
+    
+    async def fetch_and_extract_emails_batch(self, message_ids: list[str]) -> list[ExtractedEmail]:
+        """
+        Fetch and extract several emails in as few requests as possible.
+        
+        Combines fetch_email_details_batch and extract_email_content.
+        
+        Args:
+            message_ids: Gmail message IDs to fetch
+        
+        Returns:
+            List of ExtractedEmail objects, in the same order as message_ids
+            (emails Gmail did not return are left out)
+        """
+        raw_emails = await self.fetch_email_details_batch(message_ids)
+        return [extract_email_content(raw) for raw in raw_emails if raw.get("id")]
+    
+    async def fetch_and_extract_metadata_batch(
+        self, message_ids: list[str], force_refresh: bool = False
+    ) -> list[ExtractedEmail]:
+        """
+        Fetch only the headers and snippet of several emails.
+        
+        Used by the email list, which shows sender, subject and date but
+        never the body, so the base64 MIME parts are not downloaded at all.
+        Cached emails are served from memory; only the rest go to Gmail.
+        
+        Args:
+            message_ids: Gmail message IDs to fetch
+            force_refresh: Ignore cached copies and fetch everything from Gmail
+        
+        Returns:
+            List of ExtractedEmail objects, in the same order as message_ids
+            (emails Gmail did not return are left out)
+        """
+        emails = [
+            None if force_refresh else self._cache_get((message_id, "metadata"))
+            for message_id in message_ids
+        ]
+        missing = [index for index, email in enumerate(emails) if email is None]
+        
+        if missing:
+            raw_emails = await self.fetch_email_details_batch(
+                [message_ids[index] for index in missing], metadata_only=True
+            )
+            for index, raw in zip(missing, raw_emails):
+                emails[index] = extract_email_metadata(raw)
+                self._cache_put((message_ids[index], "metadata"), emails[index])
+        
+        return [email for email in emails if email.id]
     
-    def fetch_latest_email_for_llm(self, query: str = "in:inbox") -> tuple[ExtractedEmail, str]:
+    def _build_batch_body(self, message_ids: list[str], metadata_only: bool = False) -> str:
+        """
+        Build the multipart/mixed body for a Gmail batch request.
+        
+        Each part is a plain HTTP GET for one message. The Content-ID is the
+        position in message_ids so responses can be put back in order. IDs
+        are percent-encoded, so one can never change the request line or
+        add parts of its own.
+        
+        Args:
+            message_ids: Gmail message IDs to include in this batch
+            metadata_only: Request only From/Subject/Date and the snippet
+        
+        Returns:
+            The request body as a string
+        """
+        query = urlencode(self._message_params(metadata_only), safe=",()/")
+        
+        parts = []
+        for index, message_id in enumerate(message_ids):
+            parts.append(
+                f"--{self.BATCH_BOUNDARY}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <{index}>\r\n"
+                "\r\n"
+                f"GET /gmail/v1/users/me/messages/{quote(message_id, safe='')}?{query}\r\n"
+                "\r\n"
+            )
+        parts.append(f"--{self.BATCH_BOUNDARY}--\r\n")
+        return "".join(parts)
+    
+    def _parse_batch_response(self, response: httpx.Response, expected: int) -> list[dict]:
+        """
+        Split a Gmail batch response into the JSON body of each sub-response.
+        
+        Gmail answers with its own boundary and echoes every Content-ID as
+        "response-<id>", which is used to restore the request order.
+        
+        Args:
+            response: The HTTP response from the batch endpoint
+            expected: Number of sub-requests that were sent
+        
+        Returns:
+            List of Gmail message dicts (an empty dict for any missing or
+            failed part, e.g. a 404 for a deleted email or a 429)
+        
+        Raises:
+            GmailAuthError: If any sub-request was rejected as unauthorized
+        """
+        content_type = response.headers.get("Content-Type", "")
+        match = _RE_BATCH_BOUNDARY.search(content_type)
+        
+        if not match:
+            # Not a multipart answer (e.g. the whole batch was rejected)
+            logger.warning("Error fetching email batch: HTTP %s", response.status_code)
+            return [{} for _ in range(expected)]
+        
+        results = [{} for _ in range(expected)]
+        text = response.text.replace("\r\n", "\n")
+        
+        for part in text.split(f"--{match.group(1)}"):
+            part = part.strip()
+            if not part or part == "--":
+                continue
+            
+            # Outer part headers, then the embedded HTTP response
+            part_headers, _, http_response = part.partition("\n\n")
+            status_and_headers, _, body = http_response.partition("\n\n")
+            
+            # Sub-requests are authorized one by one, so a bad token can
+            # come back as 401 parts inside a successful batch response
+            status = _RE_BATCH_STATUS.match(status_and_headers)
+            if status and status.group(1) == "401":
+                raise GmailAuthError("Gmail rejected the access token")
+            
+            content_id = _RE_BATCH_CONTENT_ID.search(part_headers)
+            if not content_id:
+                continue
+            
+            # Error bodies are not messages; the part is left empty
+            if not status or not status.group(1).startswith("2"):
+                logger.warning(
+                    "Error fetching email in batch: HTTP %s",
+                    status.group(1) if status else "?"
+                )
+                continue
+            
+            index = int(content_id.group(1))
+            if index < expected:
+                try:
+                    results[index] = orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    pass
+        
+        return results
+    
+    async def fetch_recent_emails(self, query: str = "in:inbox", max_results: int = 10) -> list[ExtractedEmail]:
+        """
+        Fetch and extract the most recent emails matching a query.
+        
+        Each list page is turned into Gmail batch requests as soon as it
+        arrives, so N emails cost about N / GMAIL_BATCH_LIMIT round trips
+        instead of N, and later pages are listed while earlier ones load.
+        
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of emails to fetch
+        
+        Returns:
+            List of ExtractedEmail objects, newest first
+        
+        Raises:
+            GmailAuthError: If Gmail rejects the access token
+        """
+        fetches = []
+        try:
+            async for message_ids in self.iter_email_id_pages(query, max_results):
+                fetches.append(asyncio.ensure_future(self.fetch_and_extract_emails_batch(message_ids)))
+            
+            pages = await asyncio.gather(*fetches)
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+        
+        return [email for page in pages for email in page]
+    
+    async def fetch_latest_email_for_llm(self, query: str = "in:inbox") -> tuple[ExtractedEmail, str]:
         """
         Fetch the most recent email and format it for LLM processing.
         
@@ -636,12 +1322,12 @@ class GmailFetcher:
         Raises:
             ValueError: If no emails match the query
         """
-        messages = self.fetch_email_list(query=query, max_results=1)
+        messages = await self.fetch_email_list(query=query, max_results=1)
         
         if not messages:
             raise ValueError("No emails found matching query")
         
-        extracted = self.fetch_and_extract_email(messages[0]["id"])
+        extracted = await self.fetch_and_extract_full(messages[0]["id"])
         formatted = format_email_for_llm(extracted)
         
         return extracted, formatted
@@ -661,20 +1347,129 @@ class JobApplicationTracker:
     
     The workflow is:
         1. Check if email was already processed (by Gmail ID)
-        2. Send email to LLM for classification
+        2. Send email to LLM for classification (unless the result is cached)
         3. If it's a job email, extract company/title/status
         4. Save to Supabase 'active_applications' table
     
+    Several emails can be saved at once with save_applications(), which
+    checks for duplicates in one query, classifies the emails concurrently
+    and writes every new application in a single bulk insert.
+    
+    Gmail IDs known to be in Supabase are also recorded in a local SQLite
+    file (SEEN_EMAILS_DB), so re-processing them is answered locally
+    without a Supabase query.
+    
+    Duplicate checks and inserts rely on a unique index on email_id
+    (it makes the lookups index scans and backs the upserts' ON CONFLICT):
+        CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_active_apps_email_id
+            ON active_applications (email_id);
+    
     Attributes:
+        LLM_CONCURRENCY: Maximum LLM calls in flight during a bulk save
+        SUPABASE_MAX_CONNECTIONS: Maximum open connections to Supabase
+        http_client: Pooled HTTP client shared by all Supabase requests
         supabase: Supabase client instance
     """
     
+    # Gemini calls in parallel during a bulk save; keep under the RPM quota
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+    SUPABASE_MAX_CONNECTIONS = 10
+    
     def __init__(self):
-        """Initialize the tracker with Supabase client."""
+        """
+        Initialize the tracker with Supabase client.
+        
+        The Supabase client is given an explicit pooled HTTP client, so
+        keep-alive connections to PostgREST are reused across requests
+        for as long as the tracker lives (the API keeps a single one).
+        
+        All database access goes through PostgREST, which keeps its own
+        pool of Postgres connections, so the client side only needs to
+        stay polite: at most SUPABASE_MAX_CONNECTIONS sockets, and callers
+        beyond that wait up to 30 s for a free one instead of failing.
+        """
+        self.http_client = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(30.0, pool=30.0),
+            limits=httpx.Limits(
+                max_connections=self.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=self.SUPABASE_MAX_CONNECTIONS,
+                keepalive_expiry=30
+            )
+        )
         self.supabase: Client = create_client(
             os.getenv('SUPABASE_URL'),
-            os.getenv('SUPABASE_KEY')
+            os.getenv('SUPABASE_KEY'),
+            options=ClientOptions(httpx_client=self.http_client)
         )
+        self._llm_pool = ThreadPoolExecutor(max_workers=self.LLM_CONCURRENCY)
+        
+        # Autocommit connection shared by the API's worker threads
+        self._seen = sqlite3.connect(SEEN_EMAILS_DB, isolation_level=None, check_same_thread=False)
+        self._seen.execute("CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY)")
+        self._seen_lock = threading.Lock()
+    
+    def _filter_seen(self, gmail_ids: list[str]) -> set[str]:
+        """
+        Return the subset of Gmail IDs already recorded as saved.
+        
+        Args:
+            gmail_ids: Gmail message IDs to look up
+        
+        Returns:
+            The IDs found in the local seen table
+        """
+        if not gmail_ids:
+            return set()
+        
+        placeholders = ",".join("?" * len(gmail_ids))
+        with self._seen_lock:
+            rows = self._seen.execute(
+                f"SELECT id FROM seen WHERE id IN ({placeholders})", gmail_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def _mark_seen(self, gmail_ids):
+        """
+        Record Gmail IDs that are known to be in Supabase.
+        
+        Args:
+            gmail_ids: Iterable of Gmail message IDs
+        """
+        with self._seen_lock:
+            self._seen.executemany(
+                "INSERT OR IGNORE INTO seen (id) VALUES (?)", [(gmail_id,) for gmail_id in gmail_ids]
+            )
+    
+    def _classify(self, email: ExtractedEmail) -> Mapping[str, Any]:
+        """
+        Classify an email with the LLM (cached, see llm_evoke).
+        
+        Args:
+            email: ExtractedEmail object to classify
+        
+        Returns:
+            The LLM extraction result
+        """
+        return extract_email_info_using_gemini(self._llm_text(email))
+    
+    @staticmethod
+    def _llm_text(email: ExtractedEmail) -> str:
+        """
+        Build the text of an email that is sent to the LLM.
+        
+        The subject is put in front of the body, so it is still part of
+        the prompt when a long body gets truncated.
+        
+        Args:
+            email: ExtractedEmail object to classify
+        
+        Returns:
+            The subject and body as one string
+        """
+        if email.subject:
+            return f"Subject: {email.subject}\n\n{email.body_text}"
+        return email.body_text
     
     def save_application(self, email: ExtractedEmail) -> bool:
         """
@@ -694,42 +1489,123 @@ class JobApplicationTracker:
         gmail_id = email.id
         
         # Step 1: Check if this email was already processed
+        # The local seen table answers repeats without asking Supabase
+        if self._filter_seen([gmail_id]):
+            logger.info("- Already processed: Email ID %s", gmail_id)
+            return False
+        
         existing = self.supabase.table('active_applications').select('email_id').eq('email_id', gmail_id).execute()
         
         if existing.data:
-            print(f"- Already processed: Email ID {gmail_id[:20]}...")
+            self._mark_seen([gmail_id])
+            logger.info("- Already processed: Email ID %s", gmail_id)
             return False
         
         # Step 2: Classify and extract using LLM
-        result = extract_email_info_using_gemini(email.body_text)
+        result = self._classify(email)
         
         # Step 3: Check if LLM classified this as a job application
         if not result.get('is_job_application', False):
             reason = result.get('reasoning', 'Not classified as job application')
-            print(f"- Skipped: {reason}")
+            logger.info("- Skipped: %s", reason)
             return False
         
         company_name = result['company_name']
         job_title = result['job_title']
         
         # Step 4: Save to database
-        try:
-            self.supabase.table('active_applications').insert({
+        # A row saved meanwhile by another request is skipped, not an error
+        response = self.supabase.table('active_applications').upsert({
+            'company_name': result['company_name'],
+            'job_title': result['job_title'],
+            'status': result['status'],
+            'email_id': gmail_id
+        }, on_conflict='email_id', ignore_duplicates=True).execute()
+        
+        self._mark_seen([gmail_id])
+        
+        if not response.data:
+            logger.info("- Already tracked: %s", company_name)
+            return False
+        
+        logger.info("+ Saved: %s - %s", company_name, job_title or 'Unknown Position')
+        return True
+    
+    def save_applications(self, emails: list[ExtractedEmail]) -> list[str]:
+        """
+        Save several job applications with one duplicate check and one insert.
+        
+        This method:
+            1. Looks up which emails were already processed, in one query
+            2. Classifies the remaining emails with the LLM, in groups of
+               GEMINI_BATCH_SIZE per request and several requests at a time
+            3. Inserts every job application in a single bulk request
+        
+        Rows that already exist (e.g. saved by a concurrent request) are
+        skipped by the insert instead of failing the whole batch.
+        
+        Args:
+            emails: ExtractedEmail objects to process
+        
+        Returns:
+            Gmail IDs of the applications that were newly saved
+        """
+        # Step 1: Skip emails that were already processed (and repeated IDs)
+        ids = list(dict.fromkeys(email.id for email in emails if email.id))
+        if not ids:
+            return []
+        
+        processed = self._filter_seen(ids)
+        unknown = [gmail_id for gmail_id in ids if gmail_id not in processed]
+        
+        if unknown:
+            existing = self.supabase.table('active_applications').select('email_id').in_('email_id', unknown).execute()
+            found = {row['email_id'] for row in existing.data}
+            self._mark_seen(found)
+            processed |= found
+        
+        pending = {}
+        for email in emails:
+            if email.id and email.id not in processed:
+                pending.setdefault(email.id, email)
+        
+        # Step 2: Classify the new emails, several per LLM request and
+        # several requests at a time
+        texts = [self._llm_text(email) for email in pending.values()]
+        groups = [
+            texts[start:start + GEMINI_BATCH_SIZE]
+            for start in range(0, len(texts), GEMINI_BATCH_SIZE)
+        ]
+        results = [
+            result
+            for group_results in self._llm_pool.map(extract_email_info_batch, groups)
+            for result in group_results
+        ]
+        
+        # Step 3: Insert all job applications at once
+        rows = [
+            {
                 'company_name': result['company_name'],
                 'job_title': result['job_title'],
                 'status': result['status'],
                 'email_id': gmail_id
-            }).execute()
-            
-            print(f"+ Saved: {company_name} - {job_title or 'Unknown Position'}")
-            return True
-            
-        except Exception as e:
-            # Handle duplicate key errors gracefully
-            if 'duplicate' in str(e).lower() or '23505' in str(e):
-                print(f"- Already tracked: {company_name}")
-                return False
-            raise
+            }
+            for gmail_id, result in zip(pending, results)
+            if result.get('is_job_application', False)
+        ]
+        if not rows:
+            return []
+        
+        response = self.supabase.table('active_applications').upsert(
+            rows, on_conflict='email_id', ignore_duplicates=True
+        ).execute()
+        
+        # Skipped rows were duplicates, so every row is in Supabase now
+        self._mark_seen(row['email_id'] for row in rows)
+        
+        saved = [row['email_id'] for row in response.data]
+        logger.info("+ Saved %d of %d emails as applications", len(saved), len(emails))
+        return saved
     
     def get_all_applications(self) -> list[dict]:
         """
@@ -742,11 +1618,66 @@ class JobApplicationTracker:
         return result.data
 
 
+# =============================================================================
+# INBOX SYNC
+# =============================================================================
+
+async def sync_applications(
+    fetcher: GmailFetcher,
+    tracker: JobApplicationTracker,
+    query: str = "in:inbox",
+    max_results: int = 500
+) -> list[str]:
+    """
+    Scan an inbox and save every job application found in it.
+    
+    Fetching and classifying run as a two-stage pipeline: one task lists
+    and batch-fetches emails, GMAIL_BATCH_LIMIT at a time, while another
+    hands the previous chunk to tracker.save_applications (LLM calls and
+    one bulk insert) in a worker thread. Neither stage waits for the other
+    to finish the whole inbox, so the total time is close to that of the
+    slower stage rather than the sum of both.
+    
+    Args:
+        fetcher: Authenticated GmailFetcher
+        tracker: Tracker used to classify and save the emails
+        query: Gmail search query (same syntax as Gmail search box)
+        max_results: Maximum number of emails to scan
+    
+    Returns:
+        Gmail IDs of the applications that were newly saved
+    """
+    # Small buffer: fetching may run ahead of the LLM, but not by much
+    chunks: asyncio.Queue[Optional[list[ExtractedEmail]]] = asyncio.Queue(maxsize=2)
+    saved: list[str] = []
+    
+    async def fetch_chunks():
+        async for page in fetcher.iter_email_id_pages(query, max_results):
+            for start in range(0, len(page), fetcher.GMAIL_BATCH_LIMIT):
+                chunk = page[start:start + fetcher.GMAIL_BATCH_LIMIT]
+                await chunks.put(await fetcher.fetch_and_extract_emails_batch(chunk))
+        
+        # Sentinel: no more emails
+        await chunks.put(None)
+    
+    async def save_chunks():
+        loop = asyncio.get_running_loop()
+        while (emails := await chunks.get()) is not None:
+            saved.extend(await loop.run_in_executor(None, tracker.save_applications, emails))
+    
+    # If either stage fails, the other one is cancelled and the error raised
+    async with asyncio.TaskGroup() as group:
+        group.create_task(fetch_chunks())
+        group.create_task(save_chunks())
+    
+    return saved
+
+
 # =============================================================================
 # MAIN - Standalone script execution
 # =============================================================================
 
-def main():
+async def main(sync_count: Optional[int] = None):
     """
     Main entry point for standalone script execution.
     
@@ -755,6 +1686,13 @@ def main():
         2. Fetch the latest email
         3. Display the email content
         4. Save to Supabase if it's a job application
+    
+    With sync_count, steps 2-4 are replaced by sync_applications() over
+    that many recent inbox emails. If Gmail rejects the saved token, it is
+    deleted and the login flow runs again.
+    
+    Args:
+        sync_count: Number of recent emails to scan, or None for the demo
     """
     print("=" * 60)
     print("  Gmail Job Application Tracker")
@@ -767,15 +1705,53 @@ def main():
     token = auth.authenticate()
     print()
     
+    try:
+        await _run_main_steps(token, sync_count)
+    except GmailAuthError:
+        # A recently saved token is trusted without asking Google, so a
+        # revoked one is only noticed here
+        print("Gmail rejected the saved token. Logging in again...")
+        auth.forget_token()
+        token = auth.authenticate()
+        print()
+        await _run_main_steps(token, sync_count)
+
+
+async def _run_main_steps(token: str, sync_count: Optional[int]):
+    """
+    Run the steps of main() that come after authentication.
+    
+    Args:
+        token: Google access token from GmailAuthenticator
+        sync_count: Number of recent emails to scan, or None for the demo
+    
+    Raises:
+        GmailAuthError: If Gmail rejects the access token
+    """
+    if sync_count is not None:
+        print(f"Step 2: Scanning the {sync_count} most recent emails...")
+        fetcher = GmailFetcher(access_token=token)
+        try:
+            saved = await sync_applications(fetcher, JobApplicationTracker(), max_results=sync_count)
+        finally:
+            await fetcher.aclose()
+        
+        print()
+        print(f"Saved {len(saved)} new applications")
+        print(llm_cache.summary())
+        return
+    
     # Step 2: Fetch the latest email
     print("Step 2: Fetching most recent email...")
     fetcher = GmailFetcher(access_token=token)
     
     try:
-        extracted_email, llm_formatted = fetcher.fetch_latest_email_for_llm(query="in:inbox")
+        extracted_email, llm_formatted = await fetcher.fetch_latest_email_for_llm(query="in:inbox")
     except ValueError as e:
         print(f"Error: {e}")
         return
+    finally:
+        await fetcher.aclose()
     print()
     
     # Step 3: Display email content
@@ -796,4 +1772,18 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # python fetch_emails.py          -> process the latest email
+    # python fetch_emails.py --sync N -> scan the N most recent emails
+    sync = len(sys.argv) == 3 and sys.argv[1] == "--sync"
+    
+    # A sync covers hundreds of emails, so only problems are logged
+    # (LOG_LEVEL=INFO shows every email again)
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "WARNING" if sync else "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
+    
+    if sync:
+        asyncio.run(main(sync_count=int(sys.argv[2])))
+    else:
+        asyncio.run(main())
@@ -36,9 +36,9 @@ const Dashboard = ({ user, providerToken }) => {
     loadApplications();
   }, []);
 
-  const loadApplications = async () => {
+  const loadApplications = async (revalidate = false) => {
     try {
-      const apps = await getApplications();
+      const apps = await getApplications({ revalidate });
       setApplications(apps);
     } catch (err) {
       console.error('Failed to load applications:', err);
@@ -54,9 +54,11 @@ const Dashboard = ({ user, providerToken }) => {
     setLoading(true);
     setError(null);
     try {
-      // API returns array directly, not {emails: [...]}
-      const result = await fetchEmails(providerToken, 'in:inbox', 10);
-      setEmails(result || []);
+      // Emails are streamed, so show each one as soon as it arrives
+      setEmails([]);
+      await fetchEmails(providerToken, 'in:inbox', 10, (email) => {
+        setEmails((current) => [...current, email]);
+      });
     } catch (err) {
       setError(err.message);
     } finally {
@@ -74,7 +76,7 @@ const Dashboard = ({ user, providerToken }) => {
     setError(null);
     try {
       await processLatestEmail(providerToken);
-      await loadApplications();
+      await loadApplications(true);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -88,7 +90,7 @@ const Dashboard = ({ user, providerToken }) => {
     setProcessingId(emailId);
     try {
       await saveApplication(providerToken, emailId);
-      await loadApplications();
+      await loadApplications(true);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -136,7 +138,7 @@ const Dashboard = ({ user, providerToken }) => {
           </button>
 
           <button
-            onClick={loadApplications}
+            onClick={() => loadApplications(true)}
             className="flex items-center gap-2 bg-white/5 border border-white/10 px-6 py-3 rounded-full text-gray-400 font-bold uppercase text-sm hover:text-white hover:border-white/20 transition-colors"
           >
             <RefreshCw className="w-4 h-4" />
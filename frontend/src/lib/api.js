@@ -40,10 +40,46 @@ async function apiRequest(endpoint, options = {}, token = null) {
 
 /**
  * Fetch emails from Gmail
+ * 
+ * The backend streams emails as NDJSON (one JSON object per line), so
+ * they are parsed as they arrive. Pass `onEmail` to receive each email
+ * as soon as it is read; the full list is still returned at the end.
  */
-export async function fetchEmails(token, query = 'in:inbox', maxResults = 10) {
+export async function fetchEmails(token, query = 'in:inbox', maxResults = 10, onEmail = null) {
   const params = new URLSearchParams({ query, max_results: maxResults });
-  return apiRequest(`/api/emails?${params}`, {}, token);
+  const response = await fetch(`${API_BASE}/api/emails?${params}`, {
+    headers: { 'Authorization': `Bearer ${token}` },
+  });
+  
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+    throw new Error(error.detail || 'API request failed');
+  }
+  
+  const emails = [];
+  const handleLine = (line) => {
+    if (!line.trim()) return;
+    const email = JSON.parse(line);
+    emails.push(email);
+    if (onEmail) onEmail(email);
+  };
+  
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer + decoder.decode());
+  
+  return emails;
 }
 
 /**
@@ -60,11 +96,25 @@ export async function saveApplication(token, emailId) {
   return apiRequest(`/api/applications/save/${emailId}`, { method: 'POST' }, token);
 }
 
+/**
+ * Save several emails as job applications in one request
+ */
+export async function saveApplications(token, emailIds) {
+  return apiRequest('/api/applications/save-batch', {
+    method: 'POST',
+    body: JSON.stringify({ ids: emailIds }),
+  }, token);
+}
+
 /**
  * Get all saved applications (no auth needed for viewing)
+ * 
+ * The backend lets the browser cache this list for a short time.
+ * Pass `revalidate: true` (e.g. right after saving) to make the browser
+ * check with the server first; it still gets a cheap 304 if unchanged.
  */
-export async function getApplications() {
-  return apiRequest('/api/applications');
+export async function getApplications({ revalidate = false } = {}) {
+  return apiRequest('/api/applications', revalidate ? { cache: 'no-cache' } : {});
 }
 
 /**
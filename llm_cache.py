@@ -0,0 +1,393 @@
+"""
+LLM Extraction Cache
+====================
+
+This module provides a content-addressable cache for LLM extraction results,
+so the same email body is never sent to the LLM twice.
+
+Why cache LLM results?
+    - The LLM call is by far the slowest and most expensive step
+    - The same email is often processed more than once (retries, forwards,
+      saving the same email again from the dashboard)
+    - For a given prompt and model, the same body gives the same answer
+
+Cache keys are SHA-256 hashes of the prompt version, the model name and the
+email body (with whitespace runs collapsed, so re-wrapped copies of the same
+template share a key). Entries are kept in memory and appended to a JSON Lines
+file on disk, so they survive restarts and are shared between server workers.
+When the file holds many stale lines (overwritten keys, or more than
+LLM_CACHE_MAX_ENTRIES results), it is compacted on load.
+
+An optional semantic cache (SEMANTIC_CACHE=1, needs the "semantic" extra)
+also answers emails that are near-copies of one already classified as NOT
+job-related, e.g. the same newsletter sent again with a different date.
+Only non-job results are stored, and llm_evoke never looks up emails with
+application wording, so job emails always reach the LLM: two emails from
+the same ATS template differ in exactly the company and title we want.
+
+Usage:
+    extract_email_info_using_gemini() already reads and fills the cache,
+    so callers should not wrap it in another lookup. Inside llm_evoke:
+    
+    from llm_cache import llm_cache, make_cache_key
+    
+    key = make_cache_key(model, PROMPT_VERSION, prepared_email_text)
+    result = llm_cache.get(key)
+    if result is None:
+        result = ...  # classify with Gemini
+        llm_cache.set(key, result)
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import os
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+import orjson
+from dotenv import load_dotenv
+
+# Optional dependencies for the semantic cache (pip install ".[semantic]")
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    SentenceTransformer = None
+
+
+# Load environment variables from .env file (the settings below are read
+# at import time, possibly before any other module has loaded it)
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# File where cached results are stored (one JSON object per line)
+LLM_CACHE_FILE = os.getenv("LLM_CACHE_FILE", ".llm_cache.jsonl")
+
+# Most results kept when the file is compacted (newest first); results of old
+# prompt versions are never looked up again, so they age out this way
+LLM_CACHE_MAX_ENTRIES = 50_000
+
+# Semantic cache for near-duplicate non-job emails (off unless asked for)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"
+
+# Small local embedding model (~20 ms per email on CPU)
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for two emails to count as the same
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Most emails remembered; the oldest are replaced first (~1.5 KB each)
+SEMANTIC_CACHE_MAX_ENTRIES = 5000
+
+
+# =============================================================================
+# CACHE KEY
+# =============================================================================
+
+def make_cache_key(model: str, prompt_version: str, body: str) -> str:
+    """
+    Build the cache key for an email body.
+    
+    The prompt version and model name are part of the key, so changing
+    either one automatically invalidates old results. Whitespace in the
+    body is normalized first, since line wrapping and indentation don't
+    change the LLM's answer. The body length is included before the body
+    itself so different fields can never run together into the same bytes.
+    
+    Args:
+        model: Name of the LLM model used for extraction
+        prompt_version: Version tag of the prompt template
+        body: The email text sent to the LLM
+    
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    body_bytes = " ".join(body.split()).encode("utf-8")
+    
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode("utf-8") + b"||")
+    digest.update(model.encode("utf-8") + b"||")
+    digest.update(len(body_bytes).to_bytes(8, "little"))
+    digest.update(body_bytes)
+    
+    return digest.hexdigest()
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class LLMCache:
+    """
+    Append-only, file-backed cache of LLM extraction results.
+    
+    All entries are held in memory for fast lookups. New entries are
+    appended to the cache file, and on a miss the file is re-read from
+    where we last stopped, so results saved by other workers are picked
+    up without re-reading the whole file.
+    
+    On load, a file with at least twice as many lines as live entries (or
+    more than max_entries entries) is rewritten with just the newest
+    max_entries results. Other workers notice the new file and read it
+    from the start.
+    
+    Attributes:
+        path: Path to the JSON Lines cache file
+        max_entries: Most results kept when the file is compacted
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that found nothing
+    """
+    
+    def __init__(self, path: str = LLM_CACHE_FILE, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache and load any existing entries.
+        
+        Args:
+            path: Path to the JSON Lines cache file
+            max_entries: Most results kept when the file is compacted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: dict[str, dict] = {}
+        self._offset = 0
+        self._inode = None
+        self._lines = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        with self._lock:
+            self._load_new_entries()
+            if self._lines >= 2 * len(self._entries) > 0 or len(self._entries) > self.max_entries:
+                self._compact()
+    
+    def _load_new_entries(self):
+        """Read entries appended to the cache file since the last read."""
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, "rb") as f:
+            # Another worker compacted the file: read the new one from the start
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._inode:
+                self._inode = inode
+                self._offset = 0
+                self._lines = 0
+            
+            f.seek(self._offset)
+            for line in f:
+                # A line without a newline is still being written
+                if not line.endswith(b"\n"):
+                    break
+                
+                self._offset += len(line)
+                self._lines += 1
+                try:
+                    entry = orjson.loads(line)
+                    # Re-inserted, so the dict stays ordered oldest to newest
+                    self._entries.pop(entry["key"], None)
+                    self._entries[entry["key"]] = entry["result"]
+                except (ValueError, KeyError, TypeError):
+                    # Skip corrupted lines instead of failing the whole cache
+                    continue
+    
+    def _compact(self):
+        """Rewrite the cache file with only the newest max_entries results."""
+        keep = list(self._entries.items())[-self.max_entries:]
+        self._entries = dict(keep)
+        
+        # Written next to the file and renamed, so readers never see half of it
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            for key, result in keep:
+                f.write(orjson.dumps({"key": key, "result": result}) + b"\n")
+            self._offset = f.tell()
+            self._inode = os.fstat(f.fileno()).st_ino
+        os.replace(temp_path, self.path)
+        
+        self._lines = len(keep)
+        logger.info("Compacted LLM cache to %d entries", len(keep))
+    
+    def summary(self) -> str:
+        """
+        Describe how well the cache has worked since it was loaded.
+        
+        Returns:
+            Hit and miss counts with the hit rate, and the number of entries
+        """
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0.0
+        return (
+            f"LLM cache: {self.hits} hits, {self.misses} misses "
+            f"({rate:.0f}% hit rate), {len(self._entries)} entries"
+        )
+    
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Cache key from make_cache_key()
+        
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            
+            if result is None:
+                # Another worker may have cached it since we last looked
+                self._load_new_entries()
+                result = self._entries.get(key)
+            
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        return dict(result) if result is not None else None
+    
+    def set(self, key: str, result: dict):
+        """
+        Store a result in memory and append it to the cache file.
+        
+        Args:
+            key: Cache key from make_cache_key()
+            result: The LLM extraction result to cache
+        """
+        line = orjson.dumps({"key": key, "result": result}) + b"\n"
+        
+        with self._lock:
+            self._entries[key] = dict(result)
+            with open(self.path, "ab") as f:
+                f.write(line)
+
+
+class SemanticCache:
+    """
+    In-memory nearest-neighbour cache of non-job classifications.
+    
+    Emails are embedded with a local sentence-transformers model and
+    compared by cosine similarity (a dot product, since embeddings are
+    normalized) against every stored embedding. A brute-force search over
+    a single numpy matrix is fast enough for the few thousand emails of
+    one inbox, so no vector index is needed. The matrix is allocated once
+    with room for max_entries rows; when it is full, new emails replace
+    the oldest ones.
+    
+    The cache is disabled (every method is a no-op) unless
+    SEMANTIC_CACHE=1 and the optional dependencies are installed.
+    
+    Attributes:
+        enabled: Whether lookups can ever hit
+        max_entries: Most emails kept at once
+        hits: Number of lookups answered from the cache
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = SEMANTIC_CACHE_ENABLED,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize an empty cache; the model is loaded on first use.
+        
+        Args:
+            enabled: Turn the cache on (if the dependencies are installed)
+            max_entries: Most emails kept at once
+        """
+        self.enabled = enabled and SentenceTransformer is not None
+        self.max_entries = max_entries
+        self.hits = 0
+        self._model = None
+        self._vectors = None
+        self._results: list[dict] = []
+        self._next_slot = 0
+        self._lock = threading.Lock()
+    
+    def embed(self, text: str):
+        """
+        Compute the normalized embedding of an email.
+        
+        Args:
+            text: The email text sent to the LLM
+        
+        Returns:
+            A 1-D numpy vector, or None if the cache is disabled
+        """
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            if self._model is None:
+                self._model = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+        
+        return self._model.encode(text, normalize_embeddings=True)
+    
+    def get(self, vector) -> Optional[dict]:
+        """
+        Find the cached result of the most similar email.
+        
+        Args:
+            vector: Embedding from embed() (None is always a miss)
+        
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        if vector is None:
+            return None
+        
+        with self._lock:
+            if not self._results:
+                return None
+            
+            scores = self._vectors[:len(self._results)] @ vector
+            best = int(scores.argmax())
+            if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+                return None
+            
+            self.hits += 1
+            return dict(self._results[best])
+    
+    def set(self, vector, result: dict):
+        """
+        Store a result, if it is one that may be reused for similar emails.
+        
+        Args:
+            vector: Embedding from embed() (None is ignored)
+            result: The LLM extraction result for that email
+        """
+        if vector is None or result.get("is_job_application"):
+            return
+        
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.empty((self.max_entries, len(vector)), dtype=vector.dtype)
+            
+            slot = self._next_slot
+            self._vectors[slot] = vector
+            if slot == len(self._results):
+                self._results.append(dict(result))
+            else:
+                self._results[slot] = dict(result)
+            self._next_slot = (slot + 1) % self.max_entries
+
+
+# =============================================================================
+# SINGLETON INSTANCES
+# =============================================================================
+
+# Shared caches used by the rest of the app
+llm_cache = LLMCache()
+semantic_cache = SemanticCache()
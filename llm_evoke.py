@@ -6,8 +6,11 @@ This module handles the AI-powered classification of emails to determine
 if they are job application-related, and if so, extracts relevant information.
 
 The main function is:
-    extract_email_info_using_gemini(email_text) -> dict
+    extract_email_info_using_gemini(email_text) -> Mapping[str, Any]
     
+Several emails can share one request with:
+    extract_email_info_batch(email_texts) -> list[Mapping[str, Any]]
+
 This uses Google's Gemini model to:
     1. Classify if an email is job/internship related
     2. Extract company name, job title, and status if applicable
@@ -31,28 +34,207 @@ Usage:
 # =============================================================================
 
 import os
-import json
 import re
+import json
+import time
+import logging
+import threading
+from types import MappingProxyType
+from concurrent.futures import Future
+from typing import Any, Literal, Mapping, Optional
 
+import httpx
 from google import genai
+from google.genai import types
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+from llm_cache import llm_cache, semantic_cache, make_cache_key
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # GEMINI CLIENT SETUP
 # =============================================================================
 
+# Retry policy for Gemini requests
+# Quota (429), timeout (408) and server (5xx) errors are retried with
+# exponential backoff and jitter (1 s, 2 s, 4 s, ... up to 32 s); any other
+# error, e.g. 400 for a bad request, fails at once
+GEMINI_RETRY_OPTIONS = types.HttpRetryOptions(
+    attempts=5,
+    initial_delay=1.0,
+    max_delay=32.0,
+    http_status_codes=[408, 429, 500, 502, 503, 504],
+)
+
 # Initialize the Gemini client with API key from environment
 # Make sure GOOGLE_API_KEY is set in your .env file
-client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+# The client keeps one HTTP connection pool for the life of the process;
+# HTTP/2 and a longer keep-alive (httpx drops idle connections after 5 s by
+# default) let calls a few seconds apart reuse the same TLS connection
+client = genai.Client(
+    api_key=os.getenv("GOOGLE_API_KEY"),
+    http_options=types.HttpOptions(
+        timeout=30_000,
+        client_args={
+            "http2": True,
+            "limits": httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        },
+        retry_options=GEMINI_RETRY_OPTIONS,
+    ),
+)
+
+# Requests per minute allowed by the account's Gemini quota (0 = no limit)
+# Calls are spaced out on our side so bulk saves don't burst into 429s
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "0"))
 
 # Model to use for classification
 # Gemini 2.5 Flash is fast and cost-effective for this use case
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# Cheaper, faster model for short routine emails (e.g. ATS "thank you for
+# applying" confirmations), which leave little room for mistakes
+GEMINI_LITE_MODEL = "gemini-2.5-flash-lite"
+ROUTINE_EMAIL_MAX_CHARS = 1500
+
+# Version of the classification prompt
+# Bump this whenever the prompt changes so cached results are invalidated
+PROMPT_VERSION = "v11"
+
+# Only the start and the end of a long email are sent to the LLM
+# Whether an email is about a job application is clear from its first
+# paragraphs, and reference numbers tend to sit in the footer; newsletter
+# bodies can run past 50 KB and the middle would only add tokens
+MAX_EMAIL_CHARS = 4000
+EMAIL_TAIL_CHARS = 1000
+
+# Words that almost every job/internship email contains at least once
+# (including the stock phrasing of rejections, which can be short)
+# Emails without any of them (newsletters, password resets, receipts) are
+# rejected without an LLM call. This only has to be good at recall: false
+# positives are still classified by the LLM
+_RE_JOB_KEYWORDS = re.compile(
+    r"\b(?:appl(?:y|ied|ying|ications?)|interview\w*|offers?|positions?|roles?"
+    r"|recruit\w*|candida\w*|hir(?:e|ed|ing)|intern\w*|jobs?|careers?|resumes?"
+    r"|unfortunately|regret\w*)\b",
+    re.IGNORECASE
+)
+
+# Quoted history of replies: "> " lines, and everything from the
+# "On <date>, <name> wrote:" or Outlook "Original Message" line down
+# (forwarded messages are kept, since the forwarded email is the content).
+# The attribution must end in "wrote:" on its own line, or on the next one
+# when mail clients wrap a long attribution; a wrapped first line must look
+# like one (a year, a time or an "<address") and not end like a sentence, so
+# reply lines starting with "On" are kept.
+_RE_QUOTED_LINES = re.compile(r"^>.*(?:\n|$)", re.MULTILINE)
+_RE_QUOTED_TAIL = re.compile(
+    r"^(?:On\s[^\n]{1,300}?\swrote:[ \t]*$"
+    r"|On\s(?=[^\n]*(?:\d{4}|\d:\d\d|<))[^\n]{0,299}[^\n.!?]\n(?:[^\n]{0,300}?\s)?wrote:[ \t]*$"
+    r"|-{2,}[ \t]*Original Message[ \t]*-{2,})[\s\S]*",
+    re.MULTILINE
+)
+
+# Stock phrases of automatic application confirmations
+_RE_ROUTINE_CONFIRMATION = re.compile(
+    r"thank(?:s| you) for (?:applying|your application|your interest)"
+    r"|(?:we(?:'ve| have)|has been) received your application"
+    r"|application (?:received|confirmation)",
+    re.IGNORECASE
+)
+
+# Wording that is specific to the reader's own applications. Emails with it
+# always go to the LLM, never to the semantic cache: one wrong "not a job"
+# answer for an ATS template must not be copied to the rest of its emails
+_RE_APPLICATION_SIGNALS = re.compile(
+    r"\b(?:your (?:application|candidacy|interview|resume)|you(?:'ve| have)? applied"
+    r"|interview (?:invitation|request|with)|offer letter|job offer"
+    r"|(?:move|moving) forward with|regret to inform|not (?:be )?moving forward)\b",
+    re.IGNORECASE
+)
+
+
+# =============================================================================
+# CLASSIFICATION PROMPT
+# =============================================================================
+
+# Fixed instructions, sent as the system instruction of every request
+# Keeping them byte-for-byte identical and ahead of the email lets Gemini
+# reuse its implicit prefix cache across calls made close together
+CLASSIFICATION_INSTRUCTIONS = """Analyze the email you are given and extract information:
+
+STEP 1: Determine if this is a job or internship application email.
+Consider these as job/internship emails:
+- Application confirmations ("We received your application", "Thank you for applying")
+- Interview invitations or scheduling
+- Job/internship offers
+- Rejection letters ("Unfortunately", "We decided to move forward with other candidates")
+- Status updates about applications
+- Recruiter outreach for specific positions
+
+NOT job/internship emails:
+- Marketing emails or promotions
+- Surveys (like usability studies, feedback requests)
+- Newsletter subscriptions
+- Account notifications (password reset, login alerts)
+- General promotional content
+- Event invitations unrelated to job applications
+
+STEP 2: If it IS a job/internship email, extract the details. If NOT, leave fields as null.
+"""
+
+
+# Schema of the JSON object the LLM must return
+# Passed to Gemini as the response schema, so the model can only emit JSON of
+# this shape and the SDK parses it for us. The docstring and field
+# descriptions are sent along with the schema, so the prompt itself does not
+# have to spell out the output format
+class EmailClassification(BaseModel):
+    """Classification of one email, with the job details found in it."""
+    is_job_application: bool
+    reasoning: str = Field(description="brief 1-sentence explanation of your classification")
+    company_name: Optional[str]
+    job_title: Optional[str] = Field(description="position title")
+    status: Optional[Literal["applied", "interview", "offer", "rejected", "pending"]]
+    email_id: Optional[str] = Field(description="any reference number mentioned")
+
+
+# One entry of a batch answer. The number ties the entry to its email, so a
+# dropped or repeated entry can't shift the details of one email to another
+class BatchEmailClassification(EmailClassification):
+    """Classification of one of several numbered emails."""
+    email_number: int = Field(description="N of the EMAIL N this object is about")
+
+
+# Temperature 0 makes the answer for a given email deterministic,
+# which is what lets results be cached by body hash (see llm_cache.py)
+GENERATION_CONFIG = types.GenerateContentConfig(
+    system_instruction=CLASSIFICATION_INSTRUCTIONS,
+    temperature=0,
+    response_mime_type="application/json",
+    response_schema=EmailClassification,
+)
+
+# Several emails per request: the instructions are sent once for the whole
+# group and the answer is an array with one object per email
+GEMINI_BATCH_SIZE = 8
+
+BATCH_GENERATION_CONFIG = types.GenerateContentConfig(
+    system_instruction=CLASSIFICATION_INSTRUCTIONS + """
+You are given several emails, numbered EMAIL 1, EMAIL 2, ... Return a JSON
+array with exactly one object per email, in the same order, each with the
+number of its email.
+""",
+    temperature=0,
+    response_mime_type="application/json",
+    response_schema=list[BatchEmailClassification],
+)
+
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -84,13 +266,98 @@ def _create_empty_result(skipped: bool = False, reason: str = None) -> dict:
     }
 
 
+# Result for emails rejected by the keyword filter. Most of an inbox ends up
+# here, so one read-only copy is shared instead of building a dict each time.
+# Results that are cached or get an "error" key still use _create_empty_result().
+_NO_KEYWORDS_RESULT = MappingProxyType(
+    _create_empty_result(skipped=True, reason="No job-related keywords found")
+)
+
+
+class _RateLimiter:
+    """
+    Token bucket shared by every thread that calls Gemini.
+    
+    The bucket holds up to `per_minute` tokens and refills continuously at
+    per_minute / 60 tokens per second, so short bursts go through at once
+    and sustained load settles at the quota.
+    """
+    
+    def __init__(self, per_minute: int):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            per_minute: Requests allowed per minute (0 disables the limit)
+        """
+        self.per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent."""
+        if self.per_minute <= 0:
+            return
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.per_minute / 60
+                self._tokens = min(self.per_minute, self._tokens + refill)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) * 60 / self.per_minute
+            
+            time.sleep(wait)
+
+
+_rate_limiter = _RateLimiter(GEMINI_RPM)
+
+# Classifications in progress: cache key -> Future with the result
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _claim_inflight(cache_key: str) -> tuple[Future, bool]:
+    """
+    Register this thread as the one classifying an email.
+    
+    Args:
+        cache_key: The email's key in the exact-match cache
+    
+    Returns:
+        (future, True) if the caller now owns the classification and must
+        resolve the future and call _release_inflight(); otherwise the
+        future of the thread already classifying it, and False
+    """
+    with _inflight_lock:
+        pending = _inflight.get(cache_key)
+        if pending is not None:
+            return pending, False
+        
+        _inflight[cache_key] = future = Future()
+        return future, True
+
+
+def _release_inflight(cache_key: str):
+    """Forget a classification claimed with _claim_inflight()."""
+    with _inflight_lock:
+        del _inflight[cache_key]
+
+
 def _build_classification_prompt(email_text: str) -> str:
     """
-    Build the prompt for the LLM to classify and extract email information.
+    Build the per-email part of the prompt.
     
-    The prompt is structured to:
-        1. First classify if it's a job-related email
-        2. Then extract relevant details if applicable
+    The instructions are sent separately as the system instruction (see
+    CLASSIFICATION_INSTRUCTIONS), so only the email itself changes from
+    call to call. The email text is expected to have gone through
+    _prepare_email() already.
     
     Args:
         email_text: The plain text content of the email
@@ -98,79 +365,100 @@ def _build_classification_prompt(email_text: str) -> str:
     Returns:
         Formatted prompt string for the LLM
     """
-    prompt = f"""Analyze this email and extract information:
+    return f"Email:\n{email_text}\n"
 
-STEP 1: Determine if this is a job or internship application email.
-Consider these as job/internship emails:
-- Application confirmations ("We received your application", "Thank you for applying")
-- Interview invitations or scheduling
-- Job/internship offers
-- Rejection letters ("Unfortunately", "We decided to move forward with other candidates")
-- Status updates about applications
-- Recruiter outreach for specific positions
 
-NOT job/internship emails:
-- Marketing emails or promotions
-- Surveys (like usability studies, feedback requests)
-- Newsletter subscriptions
-- Account notifications (password reset, login alerts)
-- General promotional content
-- Event invitations unrelated to job applications
+def _prepare_email(email_text: str) -> str:
+    """
+    Reduce an email to the text worth sending to the LLM.
+    
+    Drops the quoted history of replies, then cuts the rest to at most
+    MAX_EMAIL_CHARS, keeping the beginning of the email and its last
+    EMAIL_TAIL_CHARS, where signatures and reference numbers usually are.
+    Preparing an already prepared text changes nothing.
+    
+    Args:
+        email_text: The plain text content of the email
+    
+    Returns:
+        The email text, shortened if it had quotes or was too long
+    
+    Example:
+        >>> _prepare_email("On Tuesday works for me.\\n\\nOn Mon, Jan 5, Ann <a@x.com> wrote:\\n> When?")
+        'On Tuesday works for me.'
+        >>> _prepare_email("On Tuesday works for me.\\nOn Mon, Jan 5, 2026 at 10:00 AM Ann <a@x.com> wrote:\\n> When?")
+        'On Tuesday works for me.'
+        >>> _prepare_email("See you then.\\n\\nOn Mon, Jan 5, 2026 at 10:00 AM Ann <\\na@x.com> wrote:\\n> When?")
+        'See you then.'
+    """
+    if ">" in email_text or "wrote:" in email_text or "Original Message" in email_text:
+        email_text = _RE_QUOTED_TAIL.sub("", _RE_QUOTED_LINES.sub("", email_text)).rstrip()
+    
+    if len(email_text) <= MAX_EMAIL_CHARS:
+        return email_text
+    
+    marker = "\n...\n"
+    head = email_text[:MAX_EMAIL_CHARS - EMAIL_TAIL_CHARS - len(marker)]
+    return f"{head}{marker}{email_text[-EMAIL_TAIL_CHARS:]}"
 
-STEP 2: If it IS a job/internship email, extract the details. If NOT, leave fields as null.
 
-Return ONLY a JSON object with these fields:
-{{
-    "is_job_application": true or false,
-    "reasoning": "brief 1-sentence explanation of your classification",
-    "company_name": "company name" or null,
-    "job_title": "position title" or null,
-    "status": "applied" or "interview" or "offer" or "rejected" or "pending" or null,
-    "email_id": "any reference number mentioned" or null
-}}
-
-Email:
-{email_text}
-"""
-    return prompt
+def _likely_job_email(email_text: str) -> bool:
+    """
+    Cheap pre-filter run before the LLM.
+    
+    Expects the output of _prepare_email(), i.e. the text the LLM would see.
+    
+    Args:
+        email_text: The plain text content of the email
+    
+    Returns:
+        False if the email mentions none of the job keywords
+    """
+    return _RE_JOB_KEYWORDS.search(email_text) is not None
 
 
-def _parse_llm_response(response_text: str) -> dict:
+def _pick_model(email_text: str) -> str:
     """
-    Parse the JSON response from the LLM.
+    Choose the Gemini model for an email.
     
-    The LLM should return JSON, but sometimes it includes markdown formatting
-    or extra text. This function tries multiple approaches to extract the JSON.
+    Short emails with the stock wording of an application confirmation go
+    to GEMINI_LITE_MODEL; everything else to GEMINI_MODEL.
     
     Args:
-        response_text: Raw text response from the LLM
-        
+        email_text: The plain text content of the email
+    
     Returns:
-        Parsed dictionary, or None if parsing fails
+        The model name
     """
-    # Try 1: Direct JSON parse (ideal case)
-    try:
-        return json.loads(response_text)
-    except json.JSONDecodeError:
-        pass
+    if len(email_text) <= ROUTINE_EMAIL_MAX_CHARS and _RE_ROUTINE_CONFIRMATION.search(email_text):
+        return GEMINI_LITE_MODEL
+    return GEMINI_MODEL
+
+
+def _may_use_semantic_cache(email_text: str) -> bool:
+    """
+    Whether an email may be answered from (and stored in) the semantic cache.
+    
+    Only emails that don't read like they are about the reader's own
+    application qualify, so job emails are always classified by the LLM.
     
-    # Try 2: Find JSON object in the text (LLM might add explanation text)
-    match = re.search(r'\{[\s\S]+\}', response_text)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
+    Args:
+        email_text: The plain text content of the email
     
-    # Failed to parse
-    return None
+    Returns:
+        False if the email has application confirmation or status wording
+    """
+    return (
+        _RE_ROUTINE_CONFIRMATION.search(email_text) is None
+        and _RE_APPLICATION_SIGNALS.search(email_text) is None
+    )
 
 
 # =============================================================================
 # MAIN EXTRACTION FUNCTION
 # =============================================================================
 
-def extract_email_info_using_gemini(email_text: str) -> dict:
+def extract_email_info_using_gemini(email_text: str) -> Mapping[str, Any]:
     """
     Extract job application info from email text using Gemini LLM.
     
@@ -178,22 +466,28 @@ def extract_email_info_using_gemini(email_text: str) -> dict:
     Gemini, which classifies it and extracts relevant information.
     
     The function:
-        1. Builds a prompt with the email text
-        2. Sends it to Gemini for analysis
-        3. Parses the JSON response
-        4. Returns structured data about the email
+        1. Drops quoted replies and skips emails without any job-related
+           keywords (no LLM call)
+        2. Returns the cached result if this exact email was seen before,
+           or if it closely matches a known non-job email (semantic cache)
+        3. Builds a prompt with the email text
+        4. Sends it to Gemini for analysis
+        5. Parses the JSON response
+        6. Returns structured data about the email
     
     Args:
         email_text: The plain text body of the email to analyze
         
     Returns:
-        Dictionary with the following keys:
+        Mapping with the following keys:
             - is_job_application: bool - Whether this is a job-related email
             - reasoning: str - Explanation of the classification
             - company_name: str or None - Extracted company name
             - job_title: str or None - Extracted position title
             - status: str or None - Application status (applied/interview/offer/rejected)
             - email_id: str or None - Any reference number found
+        It is read-only for emails skipped by the keyword filter, which all
+        share one instance; use dict(result) for a copy to change or serialize.
             
     Example:
         >>> result = extract_email_info_using_gemini("Thank you for applying to Google...")
@@ -202,58 +496,331 @@ def extract_email_info_using_gemini(email_text: str) -> dict:
         >>> result['company_name']
         'Google'
     """
+    # Quoted replies and the middle of very long emails are left out
+    email_text = _prepare_email(email_text)
+    
+    # Obvious non-job emails never reach the LLM
+    if not _likely_job_email(email_text):
+        logger.info("  Skipped: no job-related keywords")
+        return _NO_KEYWORDS_RESULT
+    
+    # Identical emails (retries, forwards, re-saves) are answered from the cache
+    model = _pick_model(email_text)
+    cache_key = make_cache_key(model, PROMPT_VERSION, email_text)
+    result = llm_cache.get(cache_key)
+    if result is not None:
+        return result
+    
+    # The same email being classified right now by another thread (e.g. two
+    # copies in one batch) is waited for instead of sent to Gemini again
+    future, owner = _claim_inflight(cache_key)
+    if not owner:
+        return dict(future.result())
+    
+    try:
+        result = _classify_uncached(email_text, cache_key, model)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _release_inflight(cache_key)
+
+
+def _classify_uncached(email_text: str, cache_key: str, model: str) -> dict:
+    """
+    Classify an email that is not in the exact-match cache.
+    
+    Args:
+        email_text: The plain text body of the email to analyze
+        cache_key: The email's key in the exact-match cache
+        model: Gemini model to use (see _pick_model)
+    
+    Returns:
+        Result dictionary, as described in extract_email_info_using_gemini()
+    """
+    # Near-copies of known non-job emails (no-op unless SEMANTIC_CACHE=1)
+    vector = _semantic_vector(email_text)
+    result = semantic_cache.get(vector)
+    if result is not None:
+        logger.info("  Skipped: similar to an earlier non-job email")
+        return result
+    
+    result = _call_gemini(email_text, model)
+    _cache_result(cache_key, vector, result)
+    return result
+
+
+def _semantic_vector(email_text: str):
+    """
+    Embed an email for the semantic cache, if it may use it at all.
+    
+    Args:
+        email_text: The plain text body of the email
+    
+    Returns:
+        The embedding, or None (always a miss) for emails with application
+        wording or when the semantic cache is disabled
+    """
+    if not _may_use_semantic_cache(email_text):
+        return None
+    return semantic_cache.embed(email_text)
+
+
+def _cache_result(cache_key: str, vector, result: dict):
+    """
+    Store a fresh LLM result in the exact-match and semantic caches.
+    
+    Only real classifications are cached, never API errors or truncated
+    output.
+    
+    Args:
+        cache_key: The email's key in the exact-match cache
+        vector: The email's embedding from _semantic_vector()
+        result: Result dictionary from the LLM
+    """
+    if "error" not in result:
+        llm_cache.set(cache_key, result)
+        semantic_cache.set(vector, result)
+
+
+def _call_gemini(email_text: str, model: str) -> dict:
+    """
+    Classify an email with one Gemini request (no cache).
+    
+    Args:
+        email_text: The plain text body of the email to analyze
+        model: Gemini model to use
+    
+    Returns:
+        Result dictionary, as described in extract_email_info_using_gemini()
+    """
     # Build the prompt for the LLM
     prompt = _build_classification_prompt(email_text)
     
     try:
-        # Call the Gemini API
+        # Call the Gemini API (retried by the client, see GEMINI_RETRY_OPTIONS)
+        _rate_limiter.acquire()
         response = client.models.generate_content(
-            model=GEMINI_MODEL,
+            model=model,
             contents=prompt,
+            config=GENERATION_CONFIG,
         )
         
-        # Get the text from the response
-        result_text = response.text
+        # Tokens served from Gemini's prefix cache are billed at a discount
+        usage = response.usage_metadata
+        if usage is not None and usage.cached_content_token_count:
+            logger.info("  Prompt cache hit: %d tokens", usage.cached_content_token_count)
         
-        # Parse the JSON response
-        data = _parse_llm_response(result_text)
+        # The SDK parses the JSON into an EmailClassification for us
+        # (None if the output was cut off or did not match the schema)
+        parsed = response.parsed
         
-        if data is None:
-            # Failed to parse response
-            print("Warning: Could not parse LLM response as JSON")
-            return _create_empty_result(skipped=True, reason="Failed to parse LLM response")
+        if parsed is None:
+            logger.warning("LLM response did not match the JSON schema")
+            result = _create_empty_result(skipped=True, reason="Failed to parse LLM response")
+            result["error"] = "Failed to parse LLM response"
+            return result
         
-        # Check if LLM classified this as a job application
-        is_job_app = data.get("is_job_application", False)
-        reasoning = data.get("reasoning", "No reasoning provided")
-        
-        if not is_job_app:
-            # Not a job application - return empty result with reason
-            print(f"  Skipped: {reasoning}")
-            return _create_empty_result(skipped=True, reason=reasoning)
-        
-        # It's a job application - extract and return the details
-        print(f"  Job email detected: {reasoning}")
-        
-        return {
-            "company_name": data.get("company_name"),
-            "job_title": data.get("job_title"),
-            "status": data.get("status"),
-            "email_id": data.get("email_id"),
-            "is_job_application": True,
-            "reasoning": reasoning
-        }
+        return _result_from_classification(parsed)
             
     except Exception as e:
         # Handle any errors (API errors, network issues, etc.)
         error_message = str(e)
-        print(f"  Error: {error_message}")
+        logger.error("  Error: %s", error_message)
         
         result = _create_empty_result(skipped=True, reason=f"Error: {error_message}")
         result["error"] = error_message
         return result
 
 
+def _result_from_classification(parsed: EmailClassification) -> dict:
+    """
+    Turn the LLM's answer for one email into a result dictionary.
+    
+    Args:
+        parsed: The EmailClassification parsed from the response
+    
+    Returns:
+        Result dictionary, as described in extract_email_info_using_gemini()
+    """
+    data = parsed.model_dump()
+    
+    # Check if LLM classified this as a job application
+    is_job_app = data["is_job_application"]
+    reasoning = data["reasoning"]
+    
+    if not is_job_app:
+        # Not a job application - return empty result with reason
+        logger.info("  Skipped: %s", reasoning)
+        return _create_empty_result(skipped=True, reason=reasoning)
+    
+    # It's a job application - extract and return the details
+    logger.info("  Job email detected: %s", reasoning)
+    
+    return {
+        "company_name": data.get("company_name"),
+        "job_title": data.get("job_title"),
+        "status": data.get("status"),
+        "email_id": data.get("email_id"),
+        "is_job_application": True,
+        "reasoning": reasoning
+    }
+
+
+# =============================================================================
+# BATCH EXTRACTION
+# =============================================================================
+
+def extract_email_info_batch(email_texts: list[str]) -> list[Mapping[str, Any]]:
+    """
+    Extract job application info from several emails with one Gemini call.
+    
+    Each email goes through the same steps as in
+    extract_email_info_using_gemini(): the keyword filter, the exact-match
+    cache, emails being classified by another thread right now (waited
+    for), and the semantic cache. The rest (up to GEMINI_BATCH_SIZE,
+    callers split larger lists) are classified together in a single
+    request per model (see _pick_model), which sends the instructions once
+    and costs one round trip instead of one per email. If the answer does
+    not account for every email exactly once, each one is classified on
+    its own instead.
+    
+    Args:
+        email_texts: Plain text bodies of the emails to analyze
+    
+    Returns:
+        One result per email, in the same order (see
+        extract_email_info_using_gemini() for the keys)
+    """
+    email_texts = [_prepare_email(email_text) for email_text in email_texts]
+    results: list[Optional[Mapping[str, Any]]] = [None] * len(email_texts)
+    cache_keys: dict[int, str] = {}
+    
+    # Uncached emails this call classifies, grouped by model, and emails
+    # another thread (or an identical email earlier in this batch) classifies
+    pending: dict[str, list[int]] = {}
+    claimed: dict[int, Future] = {}
+    waiting: dict[int, Future] = {}
+    
+    for index, email_text in enumerate(email_texts):
+        if not _likely_job_email(email_text):
+            results[index] = _NO_KEYWORDS_RESULT
+            continue
+        
+        model = _pick_model(email_text)
+        cache_keys[index] = make_cache_key(model, PROMPT_VERSION, email_text)
+        results[index] = llm_cache.get(cache_keys[index])
+        if results[index] is not None:
+            continue
+        
+        future, owner = _claim_inflight(cache_keys[index])
+        if owner:
+            claimed[index] = future
+            pending.setdefault(model, []).append(index)
+        else:
+            waiting[index] = future
+    
+    try:
+        for model, indexes in pending.items():
+            _classify_batch_uncached(email_texts, indexes, cache_keys, model, results)
+    except BaseException as e:
+        for future in claimed.values():
+            future.set_exception(e)
+        raise
+    else:
+        for index, future in claimed.items():
+            future.set_result(results[index])
+    finally:
+        for index in claimed:
+            _release_inflight(cache_keys[index])
+    
+    for index, future in waiting.items():
+        results[index] = dict(future.result())
+    
+    return results
+
+
+def _classify_batch_uncached(
+    email_texts: list[str],
+    indexes: list[int],
+    cache_keys: dict[int, str],
+    model: str,
+    results: list
+):
+    """
+    Classify the uncached emails of a batch that share a model.
+    
+    Args:
+        email_texts: Prepared texts of all emails in the batch
+        indexes: Positions of the emails to classify
+        cache_keys: Exact-match cache key of each position
+        model: Gemini model to use (see _pick_model)
+        results: Result list of the batch, filled in place
+    """
+    vectors = {}
+    to_send = []
+    
+    # Near-copies of known non-job emails (no-op unless SEMANTIC_CACHE=1)
+    for index in indexes:
+        vectors[index] = _semantic_vector(email_texts[index])
+        results[index] = semantic_cache.get(vectors[index])
+        if results[index] is None:
+            to_send.append(index)
+    
+    # A batch of one gains nothing over the single-email path
+    answers = None
+    if len(to_send) > 1:
+        answers = _call_gemini_batch([email_texts[i] for i in to_send], model)
+    
+    for position, index in enumerate(to_send):
+        if answers is None:
+            results[index] = _call_gemini(email_texts[index], model)
+        else:
+            results[index] = _result_from_classification(answers[position])
+        _cache_result(cache_keys[index], vectors[index], results[index])
+
+
+def _call_gemini_batch(email_texts: list[str], model: str) -> Optional[list[BatchEmailClassification]]:
+    """
+    Classify several emails with one Gemini request (no cache).
+    
+    Args:
+        email_texts: Plain text bodies of the emails to analyze
+        model: Gemini model to use
+    
+    Returns:
+        One BatchEmailClassification per email, in the order of
+        email_texts, or None if the request failed or the answer does not
+        have exactly one entry for each email number
+    """
+    prompt = "\n\n".join(
+        f"EMAIL {number}:\n{email_text}"
+        for number, email_text in enumerate(email_texts, start=1)
+    )
+    
+    try:
+        _rate_limiter.acquire()
+        response = client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=BATCH_GENERATION_CONFIG,
+        )
+    except Exception as e:
+        logger.error("  Batch error, classifying one by one: %s", e)
+        return None
+    
+    # Match entries to emails by number, not by position in the array
+    answers = response.parsed
+    numbers = [answer.email_number for answer in answers] if isinstance(answers, list) else []
+    if sorted(numbers) != list(range(1, len(email_texts) + 1)):
+        logger.warning("LLM batch answer did not match the emails, classifying one by one")
+        return None
+    
+    return sorted(answers, key=lambda answer: answer.email_number)
+
+
 # =============================================================================
 # STANDALONE EXECUTION
 # =============================================================================
@@ -263,6 +830,8 @@ if __name__ == "__main__":
     When run directly, this script reads an email from email_for_llm.txt
     and processes it through the LLM for testing purposes.
     """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    
     print("=" * 50)
     print("  LLM Email Classifier Test")
     print("=" * 50)
@@ -285,4 +854,4 @@ if __name__ == "__main__":
     
     print()
     print("Result:")
-    print(json.dumps(result, indent=2))
+    print(json.dumps(dict(result), indent=2))